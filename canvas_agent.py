@@ -5,25 +5,131 @@ A terminal-based agent that uses Gemini API to interact with Canvas via MCP tool
 """
 
 import asyncio
+import importlib
+import logging
 import os
+import re
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+import ahocorasick
 from dotenv import load_dotenv
 
 # Load environment variables FIRST, before any other imports
 load_dotenv()
 
-import google.generativeai as genai
-
 # Import your MCP tools (after env vars are loaded)
 import canvas_mcp
 
-# Debug: Check if environment variables are loaded (can be removed later)
-print(f"🔍 Environment check:")
-print(f"   GOOGLE_API_KEY: {'✅ Set' if os.getenv('GOOGLE_API_KEY') else '❌ Not set'}")
-print(f"   CANVAS_API_KEY: {'✅ Set' if os.getenv('CANVAS_API_KEY') else '❌ Not set'}")
-print(f"   CANVAS_BASE_URL: {os.getenv('CANVAS_BASE_URL', 'Not set')}")
-print("=" * 50)
+# Debug: Check if environment variables are loaded
+if os.getenv("CANVAS_DEBUG"):
+    print(f"🔍 Environment check:")
+    print(f"   GOOGLE_API_KEY: {'✅ Set' if os.getenv('GOOGLE_API_KEY') else '❌ Not set'}")
+    print(f"   CANVAS_API_KEY: {'✅ Set' if os.getenv('CANVAS_API_KEY') else '❌ Not set'}")
+    print(f"   CANVAS_BASE_URL: {os.getenv('CANVAS_BASE_URL', 'Not set')}")
+    print("=" * 50)
+
+log = logging.getLogger("canvas_agent")
+log.setLevel(logging.INFO if os.getenv("CANVAS_DEBUG") else logging.WARNING)
+
+# Intent keywords and course-id pattern, compiled once at import
+_COURSE_RE = re.compile(r'course\s*(\d+)')
+_UPCOMING_WORDS = frozenset({"upcoming", "due", "assignments", "homework"})
+_OVERDUE_WORDS = frozenset({"overdue", "late", "missed"})
+
+# Aho-Corasick automaton that finds every intent keyword in a single scan
+_INTENT_AUTOMATON = ahocorasick.Automaton()
+for _intent, _words in (("upcoming", _UPCOMING_WORDS), ("overdue", _OVERDUE_WORDS)):
+    for _word in _words:
+        _INTENT_AUTOMATON.add_word(_word, (_intent, _word))
+_INTENT_AUTOMATON.make_automaton()
+
+def _intent_hits(text: str) -> set:
+    """Intents whose keywords occur in lowercased text as whole words ("later" is not "late")"""
+    hits = set()
+    for end, (intent, word) in _INTENT_AUTOMATON.iter(text):
+        start = end - len(word) + 1
+        if (start == 0 or not text[start - 1].isalnum()) and (end + 1 == len(text) or not text[end + 1].isalnum()):
+            hits.add(intent)
+    return hits
+
+# Tools whose results can be listed without the LLM, the listing phrasings that qualify, and
+# the only words such a query may contain; anything else (a course, an exam, "should I study")
+# needs Gemini to answer
+_FAST_PATH_RE = re.compile(r"(?:show(?: me)?|list|get|what(?:'s| is| are)?)\b")
+_WORD_RE = re.compile(r"[a-z']+")
+_FAST_PATH_FILLER = frozenset({
+    "show", "me", "list", "get", "what", "what's", "whats", "is", "are", "my", "all", "the",
+    "any", "do", "i", "have", "please", "soon", "now"
+})
+_FAST_PATH_VOCAB = {
+    "get_upcoming_assignments": ("upcoming", _FAST_PATH_FILLER | _UPCOMING_WORDS),
+    "get_overdue_assignments": ("overdue", _FAST_PATH_FILLER | _OVERDUE_WORDS | {"assignments", "homework"})
+}
+
+# Intent prefetched at startup so the first "what's due" question is answered from memory,
+# as long as it is asked within _PREFETCH_TTL seconds; after that the answer is refetched
+_PREFETCH_INTENT = {"tool": "get_upcoming_assignments", "params": {}}
+_PREFETCH_TTL = 120
+
+async def _read_line(prompt: str) -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    A daemon thread is used rather than asyncio.to_thread: a thread left waiting in
+    input() after Ctrl+C would otherwise keep asyncio.run from shutting down.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(result=None, error=None):
+        if not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    def read():
+        try:
+            line = input(prompt)
+        except Exception as e:
+            loop.call_soon_threadsafe(settle, None, e)
+        else:
+            loop.call_soon_threadsafe(settle, line)
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+def _format_tool_result(tool_name: str, result: Dict[str, Any]) -> str:
+    """Format an assignment-listing tool result as plain text."""
+    assignments = result["assignments"]
+    if tool_name == "get_overdue_assignments":
+        lines = [f"You have {len(assignments)} overdue assignment(s):"]
+        for a in assignments:
+            lines.append(
+                f"- {a['assignment_name']} ({a['course_name']}) - was due {a['due_date_formatted']}, "
+                f"{a['days_overdue']} day(s) overdue, {a['points_possible']} pts"
+            )
+    else:
+        lines = [f"You have {len(assignments)} upcoming assignment(s) ({result.get('date_range', '')}):"]
+        for a in assignments:
+            lines.append(
+                f"- {a['assignment_name']} ({a['course_name']}) - due {a['due_date_formatted']}, "
+                f"in {a['days_until_due']} day(s), {a['points_possible']} pts"
+            )
+    return "\n".join(lines)
+
+def _is_plain_listing(user_input: str, tool_name: str) -> bool:
+    """Whether a query only asks for the listing tool_name returns, with nothing else to answer"""
+    if tool_name not in _FAST_PATH_VOCAB:
+        return False
+    text = user_input.strip().lower()
+    intent, vocab = _FAST_PATH_VOCAB[tool_name]
+    hits = _intent_hits(text)
+    return (intent in hits
+            and _FAST_PATH_RE.match(text) is not None
+            and all(word in vocab for word in _WORD_RE.findall(text)))
 
 class CanvasAgent:
     def __init__(self):
@@ -32,6 +138,9 @@ class CanvasAgent:
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
         
+        # The Gemini SDK is slow to import, so load it only when an agent is created
+        genai = importlib.import_module("google.generativeai")
+        
         # Configure the Gemini API
         genai.configure(api_key=self.api_key)
         
@@ -45,71 +154,68 @@ class CanvasAgent:
             "get_overdue_assignments": canvas_mcp.get_overdue_assignments.fn
         }
         
+        # Background fetch of the most common query, started in run_interactive
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._prefetch_started = 0.0
+        
 
     async def call_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
         """Call an MCP tool and return the result."""
-        print(f"🔧 Calling tool: {tool_name}")
-        print(f"📝 Tool parameters: {kwargs}")
+        log.info("Calling tool %s with %s", tool_name, kwargs)
         
         if tool_name not in self.tools:
             error_msg = f"Tool {tool_name} not found"
-            print(f"❌ {error_msg}")
+            log.warning(error_msg)
             return {"error": error_msg}
         
         try:
             result = await self.tools[tool_name](**kwargs)
-            print(f"✅ Tool {tool_name} completed successfully")
+            log.info("Tool %s completed successfully", tool_name)
             return result
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Tool {tool_name} failed: {error_msg}")
+            log.warning("Tool %s failed: %s", tool_name, error_msg)
             return {"error": error_msg}
 
     def parse_user_intent(self, user_input: str) -> Dict[str, Any]:
         """Parse user input to determine intent and extract parameters."""
         user_input_lower = user_input.lower()
+        hits = _intent_hits(user_input_lower)
+        course_id_match = _COURSE_RE.search(user_input_lower)
         
         # Check for specific intents
-        if any(word in user_input_lower for word in ["upcoming", "due", "assignments", "homework"]):
-            if "course" in user_input_lower and any(char.isdigit() for char in user_input):
-                # Extract course ID if mentioned
-                import re
-                course_id_match = re.search(r'course\s*(\d+)', user_input_lower)
-                if course_id_match:
-                    course_id = int(course_id_match.group(1))
-                    return {
-                        "tool": "get_assignments_by_course",
-                        "params": {"course_id": course_id}
-                    }
-            return {"tool": "get_upcoming_assignments", "params": {}}
-        
-        elif any(word in user_input_lower for word in ["overdue", "late", "missed"]):
+        if "overdue" in hits:
             return {"tool": "get_overdue_assignments", "params": {}}
         
-        elif "course" in user_input_lower and any(char.isdigit() for char in user_input):
-            import re
-            course_id_match = re.search(r'course\s*(\d+)', user_input_lower)
-            if course_id_match:
-                course_id = int(course_id_match.group(1))
-                return {
-                    "tool": "get_assignments_by_course",
-                    "params": {"course_id": course_id}
-                }
+        if course_id_match:
+            return {
+                "tool": "get_assignments_by_course",
+                "params": {"course_id": int(course_id_match.group(1))}
+            }
         
         # Default to upcoming assignments
         return {"tool": "get_upcoming_assignments", "params": {}}
 
-    async def process_query(self, user_input: str) -> str:
-        """Process a user query and return a response."""
+    async def process_query_stream(self, user_input: str) -> AsyncIterator[str]:
+        """Process a user query and yield the response text as it is generated."""
         try:
-            print(f"🤔 Processing query: '{user_input}'")
+            log.info("Processing query: %r", user_input)
             
             # Parse user intent
             intent = self.parse_user_intent(user_input)
-            print(f"🎯 Detected intent: {intent}")
+            log.info("Detected intent: %s", intent)
             
-            # Call the appropriate tool
-            tool_result = await self.call_tool(intent["tool"], **intent["params"])
+            # Call the appropriate tool, reusing the startup prefetch when it matches and is fresh
+            prefetch = self._take_prefetch() if intent == _PREFETCH_INTENT else None
+            if prefetch is not None:
+                tool_result = await prefetch
+            else:
+                tool_result = await self.call_tool(intent["tool"], **intent["params"])
+            
+            # Plain listing requests are formatted locally without a Gemini round-trip
+            if _is_plain_listing(user_input, intent["tool"]) and tool_result.get("assignments"):
+                yield _format_tool_result(intent["tool"], tool_result)
+                return
             
             # Create a prompt for the LLM to format the response
             prompt = f"""You are a helpful Canvas assignment assistant. You can help users with:
@@ -127,13 +233,32 @@ I called the tool {intent["tool"]} with parameters {intent["params"]} and got th
 
 Please provide a helpful, formatted response to the user based on this data. If there are any errors, explain them clearly. Always format dates nicely and provide relevant details like course names, due dates, and points possible."""
 
-            # Generate response using Gemini
-            response = self.model.generate_content(prompt)
-            
-            return response.text
+            # Stream the response from Gemini as tokens arrive
+            stream = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in stream:
+                yield chunk.text
             
         except Exception as e:
-            return f"Sorry, I encountered an error: {str(e)}"
+            yield f"Sorry, I encountered an error: {str(e)}"
+
+    def _take_prefetch(self) -> Optional[asyncio.Task]:
+        """Hand out the startup prefetch once, or drop it if it has gone stale"""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None and time.monotonic() - self._prefetch_started > _PREFETCH_TTL:
+            task.cancel()
+            return None
+        return task
+    
+    async def _cancel_prefetch(self):
+        """Cancel an unused prefetch and wait for it to finish"""
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def process_query(self, user_input: str) -> str:
+        """Process a user query and return a response."""
+        return "".join([chunk async for chunk in self.process_query_stream(user_input)])
 
     async def run_interactive(self):
         """Run the agent in interactive mode."""
@@ -147,9 +272,22 @@ Please provide a helpful, formatted response to the user based on this data. If
         print("- 'Type 'quit' to exit")
         print("=" * 50)
         
+        # Warm the most common answer while the user is typing
+        self._prefetch_started = time.monotonic()
+        self._prefetch_task = asyncio.create_task(
+            self.call_tool(_PREFETCH_INTENT["tool"], **_PREFETCH_INTENT["params"])
+        )
+        
+        try:
+            await self._interactive_loop()
+        finally:
+            await self._cancel_prefetch()
+    
+    async def _interactive_loop(self):
+        """Answer questions until the user quits or closes stdin"""
         while True:
             try:
-                user_input = input("\n🤔 Your question: ").strip()
+                user_input = (await _read_line("\n🤔 Your question: ")).strip()
                 
                 if user_input.lower() in ['quit', 'exit', 'bye']:
                     print("👋 Goodbye!")
@@ -159,10 +297,13 @@ Please provide a helpful, formatted response to the user based on this data. If
                     continue
                 
                 print("\n🔄 Thinking...")
-                response = await self.process_query(user_input)
-                print(f"\n🤖 Assistant: {response}")
+                prefix = "\n🤖 Assistant: "
+                async for chunk in self.process_query_stream(user_input):
+                    print(prefix + chunk, end="", flush=True)
+                    prefix = ""
+                print()
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n👋 Goodbye!")
                 break
             except Exception as e:
@@ -170,12 +311,19 @@ Please provide a helpful, formatted response to the user based on this data. If
 
 async def main():
     """Main function to run the agent."""
+    logging.basicConfig(level=logging.DEBUG if os.getenv("CANVAS_DEBUG") else logging.WARNING)
     try:
         agent = CanvasAgent()
         await agent.run_interactive()
     except Exception as e:
         print(f"Failed to start agent: {str(e)}")
         sys.exit(1)
+    finally:
+        await canvas_mcp.close_client()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # Ctrl+C cancels main(); its finally blocks have already cleaned up
+        print("\n👋 Goodbye!")
\ No newline at end of file
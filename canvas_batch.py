@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Non-interactive Gemini summaries submitted through Gemini Batch Mode.
+
+Used by `canvas_cli.py digest`: assignments for every requested course are
+fetched concurrently, one summarization prompt is built per course, and all
+prompts go to Gemini as a single inline batch job instead of N separate calls.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Sequence
+
+import canvas_mcp
+
+log = logging.getLogger("canvas_batch")
+
+BATCH_MODEL = "gemini-2.5-flash"
+POLL_INTERVAL = float(os.getenv("CANVAS_BATCH_POLL_SECONDS", "10"))
+_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def _get_genai_client():
+    """Create a google-genai client (imported lazily, like the agent's SDK)."""
+    from google import genai
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY environment variable is required")
+    return genai.Client(api_key=api_key)
+
+
+def build_course_prompt(course_result: Dict[str, Any]) -> str:
+    """Build the digest prompt for one course's get_assignments_by_course result."""
+    return f"""You are a helpful Canvas assignment assistant writing a short daily digest.
+
+Summarize the upcoming work for the course "{course_result.get('course_name', course_result.get('course_id'))}".
+Group assignments by urgency, mention due dates and points possible, and keep it brief.
+
+Assignment data:
+
+{course_result}"""
+
+
+async def run_batch(prompts: Sequence[str], model: str = BATCH_MODEL) -> List[str]:
+    """
+    Submit prompts as one inline Gemini batch job and wait for it to finish.
+
+    Args:
+        prompts: Prompt texts, one request each
+        model: Gemini model name
+
+    Returns:
+        Response texts in the same order as the prompts
+    """
+    if not prompts:
+        return []
+    client = _get_genai_client()
+    requests = [{"contents": [{"role": "user", "parts": [{"text": p}]}]} for p in prompts]
+    job = await client.aio.batches.create(model=model, src=requests)
+    log.info("Submitted batch %s with %d request(s)", job.name, len(requests))
+
+    while job.state.name not in _DONE_STATES:
+        await asyncio.sleep(POLL_INTERVAL)
+        job = await client.aio.batches.get(name=job.name)
+        log.debug("Batch %s state: %s", job.name, job.state.name)
+
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        raise RuntimeError(f"Gemini batch {job.name} ended in state {job.state.name}")
+
+    # Inline responses come back in request order
+    texts = []
+    for item in job.dest.inlined_responses:
+        if item.response is not None:
+            texts.append(item.response.text)
+        else:
+            texts.append(f"Error: {item.error}")
+    return texts
+
+
+async def course_digest(course_ids: Sequence[int], days_ahead: int = 30) -> Dict[str, Any]:
+    """
+    Fetch assignments for several courses in parallel and summarize them in one batch.
+
+    Args:
+        course_ids: Canvas course IDs to include
+        days_ahead: Number of days ahead to look for assignments (default: 30)
+
+    Returns:
+        Dictionary with one summary per course
+    """
+    fetch = canvas_mcp.get_assignments_by_course.fn
+    try:
+        results = await asyncio.gather(*(fetch(cid, days_ahead) for cid in course_ids))
+        ok = [r for r in results if r.get("success")]
+        summaries = await run_batch([build_course_prompt(r) for r in ok])
+        by_course = {r["course_id"]: s for r, s in zip(ok, summaries)}
+        return {
+            "success": True,
+            "total_courses": len(course_ids),
+            "digests": [
+                {
+                    "course_id": r.get("course_id", cid),
+                    "course_name": r.get("course_name"),
+                    "total_assignments": r.get("total_assignments", 0),
+                    "summary": by_course.get(cid),
+                    "error": r.get("error"),
+                }
+                for cid, r in zip(course_ids, results)
+            ],
+        }
+    finally:
+        await canvas_mcp.close_client()
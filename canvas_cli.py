@@ -1,69 +1,146 @@
 #!/usr/bin/env python3
 import argparse
+import ast
 import asyncio
-import json
+import importlib.util
 import os
 import sys
 
-# Prefer the complete tool registry if available
-try:
-    from canvas_mcp_complete import run_tool, list_available_tools  # type: ignore
-    HAS_COMPLETE = True
-except Exception:
-    HAS_COMPLETE = False
+import orjson
 
-# Fallback: import a subset from canvas_mcp (minimal tools)
-if not HAS_COMPLETE:
-    from typing import Any, Dict
+# Fallback: a subset of tools from canvas_mcp (minimal tools)
+async def _fallback_list_available_tools():
+    return {
+        "success": True,
+        "data": {
+            "total_tools": 3,
+            "tools": {
+                "get_upcoming_assignments": {"name": "get_upcoming_assignments", "description": "Get upcoming assignments"},
+                "get_assignments_by_course": {"name": "get_assignments_by_course", "description": "Get assignments by course"},
+                "get_overdue_assignments": {"name": "get_overdue_assignments", "description": "Get overdue assignments"},
+            },
+        },
+    }
+
+
+async def _fallback_run_tool(tool_name: str, **kwargs):
     from canvas_mcp import get_upcoming_assignments, get_assignments_by_course, get_overdue_assignments  # type: ignore
 
-    async def list_available_tools():
-        return {
-            "success": True,
-            "data": {
-                "total_tools": 3,
-                "tools": {
-                    "get_upcoming_assignments": {"name": "get_upcoming_assignments", "description": "Get upcoming assignments"},
-                    "get_assignments_by_course": {"name": "get_assignments_by_course", "description": "Get assignments by course"},
-                    "get_overdue_assignments": {"name": "get_overdue_assignments", "description": "Get overdue assignments"},
-                },
-            },
-        }
+    tools = {
+        "get_upcoming_assignments": get_upcoming_assignments,
+        "get_assignments_by_course": get_assignments_by_course,
+        "get_overdue_assignments": get_overdue_assignments,
+    }
+    if tool_name not in tools:
+        return {"success": False, "error": f"Unknown tool: {tool_name}"}
+    return await tools[tool_name](**kwargs)
+
 
-    async def run_tool(tool_name: str, **kwargs):
-        tools = {
-            "get_upcoming_assignments": get_upcoming_assignments,
-            "get_assignments_by_course": get_assignments_by_course,
-            "get_overdue_assignments": get_overdue_assignments,
-        }
-        if tool_name not in tools:
-            return {"success": False, "error": f"Unknown tool: {tool_name}"}
-        return await tools[tool_name](**kwargs)
+# Local modules the complete registry imports names from
+_REGISTRY_MODULES = ("canvas_mcp_complete", "canvas_mcp_additional", "canvas_mcp")
+
+
+def _module_tree(name: str):
+    """Parse a local module's source without importing it, or None if it can't be found"""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    with open(spec.origin, "rb") as f:
+        return ast.parse(f.read())
+
+
+def _defined_names(tree) -> set:
+    """Top-level names a module defines"""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+    return names
+
+
+def _complete_registry_importable() -> bool:
+    """
+    Check that canvas_mcp_complete's imports between the local tool modules resolve.
+    
+    Only their sources are parsed, so a registry that would fail to import is skipped
+    without paying for canvas_mcp's fastmcp/httpx/pandas imports first.
+    """
+    try:
+        trees = {name: _module_tree(name) for name in _REGISTRY_MODULES}
+    except (OSError, SyntaxError, ImportError, ValueError):
+        return False
+    if any(tree is None for tree in trees.values()):
+        return False
+    defined = {name: _defined_names(tree) for name, tree in trees.items()}
+    for tree in trees.values():
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and node.module in defined:
+                if any(alias.name not in defined[node.module] for alias in node.names):
+                    return False
+    return True
+
+
+def _load_registry():
+    """Import the tool registry on first use, preferring the complete one when it can load."""
+    if not _complete_registry_importable():
+        return _fallback_list_available_tools, _fallback_run_tool
+    try:
+        from canvas_mcp_complete import run_tool, list_available_tools  # type: ignore
+    except Exception:
+        return _fallback_list_available_tools, _fallback_run_tool
+    return list_available_tools, run_tool
+
+
+def _write_json(obj):
+    # Flush pending text output first so the JSON line is not interleaved with it
+    sys.stdout.flush()
+    # Tool results may carry numpy scalars/arrays or int-keyed dicts; let orjson encode them natively
+    sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 async def main():
     parser = argparse.ArgumentParser(description="Canvas MCP CLI bridge")
-    parser.add_argument("command", choices=["list-tools", "call"], help="What to do")
+    parser.add_argument("command", choices=["list-tools", "call", "digest"], help="What to do")
     parser.add_argument("--tool", dest="tool", help="Tool name for call")
     parser.add_argument("--args", dest="args_json", help="JSON args for tool", default="{}")
+    parser.add_argument("--courses", help="Comma-separated course IDs for digest")
+    parser.add_argument("--days-ahead", dest="days_ahead", type=int, default=30, help="Days ahead for digest")
     # Canvas creds via env: CANVAS_API_URL, CANVAS_API_KEY
     args = parser.parse_args()
 
     try:
+        if args.command == "digest":
+            if not args.courses:
+                raise ValueError("--courses is required for 'digest'")
+            from canvas_batch import course_digest
+
+            course_ids = [int(c) for c in args.courses.split(",") if c.strip()]
+            _write_json(await course_digest(course_ids, args.days_ahead))
+            return
+
+        # Tool modules pull in httpx/fastmcp, so only import them once a command needs them
+        list_available_tools, run_tool = _load_registry()
         if args.command == "list-tools":
             result = await list_available_tools()
         else:
             if not args.tool:
                 raise ValueError("--tool is required for 'call'")
             try:
-                tool_args = json.loads(args.args_json) if args.args_json else {}
+                tool_args = orjson.loads(args.args_json) if args.args_json else {}
             except Exception as e:
                 raise ValueError(f"Invalid --args JSON: {e}")
             result = await run_tool(args.tool, **tool_args)
 
-        print(json.dumps(result))
+        _write_json(result)
     except Exception as e:
-        print(json.dumps({"success": False, "error": str(e)}))
+        _write_json({"success": False, "error": str(e)})
         sys.exit(1)
 
 
@@ -1,10 +1,20 @@
 import asyncio
+import itertools
+import logging
 import os
-from datetime import datetime, timedelta
-from typing import Any, Sequence
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Sequence
+import ciso8601
 import httpx
+import orjson
+import pandas as pd
+from aiolimiter import AsyncLimiter
 from fastmcp import FastMCP
 
+log = logging.getLogger("canvas_mcp")
+
 # Initialize the MCP server
 mcp = FastMCP("Canvas Assignments Server")
 
@@ -12,33 +22,476 @@ mcp = FastMCP("Canvas Assignments Server")
 CANVAS_BASE_URL = os.getenv("CANVAS_BASE_URL", "https://gatech.instructure.com")
 CANVAS_API_KEY = os.getenv("CANVAS_API_KEY")
 
-# Debug: Check if environment variables are loaded in MCP (can be removed later)
-print(f"🔍 MCP Environment check:")
-print(f"   CANVAS_API_KEY: {'✅ Set' if CANVAS_API_KEY else '❌ Not set'}")
-print(f"   CANVAS_BASE_URL: {CANVAS_BASE_URL}")
+# Debug: Check if environment variables are loaded in MCP
+if os.getenv("CANVAS_DEBUG"):
+    print(f"🔍 MCP Environment check:")
+    print(f"   CANVAS_API_KEY: {'✅ Set' if CANVAS_API_KEY else '❌ Not set'}")
+    print(f"   CANVAS_BASE_URL: {CANVAS_BASE_URL}")
+
+# Shared HTTP client, created on first use so every request reuses pooled connections
+_client: httpx.AsyncClient | None = None
+
+async def _get_client() -> httpx.AsyncClient:
+    """Return the shared Canvas HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        if not CANVAS_API_KEY:
+            raise ValueError("CANVAS_API_KEY environment variable is required")
+        
+        _client = httpx.AsyncClient(
+            base_url=CANVAS_BASE_URL,
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {CANVAS_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=30
+        )
+    return _client
+
+def set_client(client: httpx.AsyncClient):
+    """Use client for all Canvas requests instead of the lazily created default"""
+    global _client
+    _client = client
+
+async def close_client():
+    """Close the shared Canvas HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Cap concurrent requests and request rate so gathered fan-out stays under Canvas throttling
+_sem = asyncio.Semaphore(int(os.getenv("CANVAS_MAX_CONCURRENCY", "16")))
+_limiter = AsyncLimiter(10, 1)
+MAX_RETRIES = 3
+
+# In-process response cache of parsed JSON: (endpoint, params) -> (fetched_at, data).
+# Bounded FIFO so long-running servers don't grow it without limit.
+_response_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+RESPONSE_CACHE_MAX = 1024
+
+# Active courses rarely change during a semester, so cache them for 10 minutes
+COURSES_CACHE_TTL = 600
+
+# Fetches currently in flight, keyed like the cache, so identical concurrent calls share one
+_inflight: dict[tuple, asyncio.Task] = {}
+
+def _cache_key(endpoint: str, params: dict = None) -> tuple:
+    """Build a hashable cache key from an endpoint and its query params"""
+    items = (params or {}).items()
+    return (endpoint, frozenset(
+        (key, tuple(value) if isinstance(value, list) else value) for key, value in items
+    ))
+
+def _cache_store(key: tuple, data: Any):
+    """Remember a parsed response, evicting the oldest entries past RESPONSE_CACHE_MAX"""
+    _response_cache.pop(key, None)
+    _response_cache[key] = (time.monotonic(), data)
+    while len(_response_cache) > RESPONSE_CACHE_MAX:
+        _response_cache.popitem(last=False)
 
-async def make_canvas_request(endpoint: str, params: dict = None):
-    """Make an authenticated request to the Canvas API"""
+def _release_inflight(key: tuple, task: asyncio.Future):
+    """Forget an in-flight fetch, unless the key has since been taken over by another one"""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+async def _single_flight(key: tuple, fetch):
+    """Run fetch() once for all concurrent callers with the same key"""
+    while True:
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            _inflight[key] = task
+            task.add_done_callback(lambda done: _release_inflight(key, done))
+        try:
+            # Shield so one caller being cancelled doesn't cancel the fetch for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # A streaming run that was abandoned part way cancels its shared future;
+            # only then start over, otherwise it is this caller being cancelled
+            if not task.cancelled():
+                raise
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Whether Canvas throttled the request; it answers 403 "Rate Limit Exceeded" rather than 429"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    # Canvas sends X-Rate-Limit-Remaining on every response, so only an exhausted bucket counts
+    remaining = response.headers.get("X-Rate-Limit-Remaining")
+    try:
+        if remaining is not None and float(remaining) <= 0:
+            return True
+    except ValueError:
+        pass
+    return "rate limit exceeded" in response.text.lower()
+
+async def _send_request(url: str, params: dict = None, json: Any = None) -> httpx.Response:
+    """Send a rate-limited GET (or POST when json is given) to Canvas, retrying when throttled, and raise on errors"""
+    client = await _get_client()
+    for attempt in range(MAX_RETRIES + 1):
+        async with _sem, _limiter:
+            if json is None:
+                response = await client.get(url, params=params)
+            else:
+                response = await client.post(url, json=json)
+        if not _is_rate_limited(response) or attempt == MAX_RETRIES:
+            break
+        # Back off exponentially, honoring Retry-After when Canvas sends it
+        retry_after = response.headers.get("Retry-After")
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+        await asyncio.sleep(delay)
+    log.debug("Canvas API request %s -> %s", response.url, response.status_code)
+    
+    if response.status_code != 200:
+        log.warning("Canvas API error %s - %s", response.status_code, response.text)
+        response.raise_for_status()
+    
+    return response
+
+async def make_canvas_request(endpoint: str, params: dict = None, cache_ttl: int = 0):
+    """Make an authenticated request to the Canvas API
+    
+    Responses are memoized in-process for cache_ttl seconds when cache_ttl > 0.
+    """
     if not CANVAS_API_KEY:
         raise ValueError("CANVAS_API_KEY environment variable is required")
     
-    headers = {
-        "Authorization": f"Bearer {CANVAS_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    key = _cache_key(endpoint, params)
+    if cache_ttl > 0:
+        cached = _response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < cache_ttl:
+            return cached[1]
     
-    url = f"{CANVAS_BASE_URL}/api/v1{endpoint}"
+    async def fetch():
+        response = await _send_request(f"/api/v1{endpoint}", params)
+        return orjson.loads(response.content)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        print(f"🔍 Canvas API Request: {url}")
-        print(f"📊 Response Status: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"❌ Canvas API Error: {response.status_code} - {response.text}")
-            response.raise_for_status()
+    data = await _single_flight(key, fetch)
+    if cache_ttl > 0:
+        _cache_store(key, data)
+    return data
+
+def _page_number(url: str) -> int | None:
+    """Extract a numeric page parameter from a Canvas pagination link"""
+    page = httpx.URL(url).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+def parse_date_string(value: str | None) -> datetime | None:
+    """Parse a Canvas ISO 8601 timestamp (naive values are taken as UTC), or None if empty/malformed"""
+    if not value:
+        return None
+    try:
+        parsed = ciso8601.parse_datetime(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def format_response(success: bool, data: Any = None, error: str | None = None, metadata: dict | None = None) -> dict[str, Any]:
+    """
+    Build the standard tool response envelope.
+
+    The envelope stays a plain dict so FastMCP can serialize it as structured
+    tool output; JSON encoding happens at the edges (see canvas_cli.py).
+    """
+    response: dict[str, Any] = {"success": success, "timestamp": datetime.now().isoformat()}
+    if success:
+        response["data"] = data
+    else:
+        response["error"] = {"message": error or "Unknown error"}
+    if metadata is not None:
+        response["metadata"] = metadata
+    return response
+
+async def get_all_paginated_data(endpoint: str, params: dict = None, cache_ttl: int = 0) -> list:
+    """
+    Fetch every page of a paginated Canvas collection.
+    
+    The first page's Link header is used to find the last page number so the
+    remaining pages can be fetched concurrently. Endpoints that only expose
+    opaque bookmarks are walked serially via rel="next".
+    """
+    if not CANVAS_API_KEY:
+        raise ValueError("CANVAS_API_KEY environment variable is required")
+    
+    params = {"per_page": 100, **(params or {})}
+    key = ("all_pages",) + _cache_key(endpoint, params)
+    if cache_ttl > 0:
+        cached = _response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < cache_ttl:
+            return cached[1]
+    
+    items = await _single_flight(key, lambda: _fetch_all_pages(f"/api/v1{endpoint}", params))
+    
+    if cache_ttl > 0:
+        _cache_store(key, items)
+    return items
+
+async def _fetch_all_pages(url: str, params: dict) -> list:
+    """Fetch page 1, then the remaining pages concurrently or by following next links"""
+    first = await _send_request(url, params)
+    items = orjson.loads(first.content)
+    
+    last = first.links.get("last")
+    last_page = _page_number(last["url"]) if last else None
+    if last_page:
+        pages = await asyncio.gather(*(
+            _send_request(url, {**params, "page": page}) for page in range(2, last_page + 1)
+        ))
+        for response in pages:
+            items.extend(orjson.loads(response.content))
+    else:
+        next_link = first.links.get("next")
+        while next_link:
+            response = await _send_request(next_link["url"])
+            items.extend(orjson.loads(response.content))
+            next_link = response.links.get("next")
+    return items
+
+async def iter_paginated_data(endpoint: str, params: dict = None, cache_ttl: int = 0) -> AsyncIterator[Any]:
+    """
+    Yield the items of a paginated Canvas collection as each page arrives.
+    
+    Pages are requested the same way as get_all_paginated_data, but callers can
+    work on page 1 while later pages are still in flight; items keep page order.
+    A fully consumed run is stored under the same cache key as the list version,
+    and concurrent identical requests (from either helper) share one fetch.
+    """
+    if not CANVAS_API_KEY:
+        raise ValueError("CANVAS_API_KEY environment variable is required")
+    
+    params = {"per_page": 100, **(params or {})}
+    key = ("all_pages",) + _cache_key(endpoint, params)
+    if cache_ttl > 0:
+        cached = _response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < cache_ttl:
+            for item in cached[1]:
+                yield item
+            return
+    
+    # Join an identical fetch already in flight from either paginated helper
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            shared = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The other run was abandoned part way; fetch independently instead
+            if not pending.cancelled():
+                raise
+        else:
+            for item in shared:
+                yield item
+            return
+    
+    # Publish this run so concurrent identical requests wait for it instead of refetching
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(lambda done: done.cancelled() or done.exception())
+    _inflight[key] = future
+    
+    url = f"/api/v1{endpoint}"
+    tasks = []
+    try:
+        first = await _send_request(url, params)
+        items = orjson.loads(first.content)
         
-        return response.json()
+        # Start the remaining pages before handing out page 1 so they download meanwhile
+        last = first.links.get("last")
+        last_page = _page_number(last["url"]) if last else None
+        tasks = [
+            asyncio.ensure_future(_send_request(url, {**params, "page": page}))
+            for page in range(2, (last_page or 1) + 1)
+        ]
+        for item in items:
+            yield item
+        if last_page:
+            for task in tasks:
+                page_items = orjson.loads((await task).content)
+                items.extend(page_items)
+                for item in page_items:
+                    yield item
+        else:
+            next_link = first.links.get("next")
+            while next_link:
+                response = await _send_request(next_link["url"])
+                page_items = orjson.loads(response.content)
+                items.extend(page_items)
+                for item in page_items:
+                    yield item
+                next_link = response.links.get("next")
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(items)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Closed early or cancelled: waiters see the cancellation and fetch for themselves
+        if not future.done():
+            future.cancel()
+        _release_inflight(key, future)
+    
+    if cache_ttl > 0:
+        _cache_store(key, items)
+
+async def get_active_courses():
+    """Get the user's active courses, cached for COURSES_CACHE_TTL seconds"""
+    return await get_all_paginated_data("/courses", {
+        "enrollment_state": "active"
+    }, cache_ttl=COURSES_CACHE_TTL)
+
+# Assignment fields shared by the bulk and per-course queries; the caller's own
+# submission (if any) shows up in submissionsConnection
+_ASSIGNMENT_FIELDS = """
+fragment AssignmentFields on Assignment {
+  _id
+  name
+  dueAt
+  pointsPossible
+  htmlUrl
+  description
+  submissionTypes
+  submissionsConnection(first: 1) {
+    nodes {
+      submittedAt
+    }
+  }
+}
+"""
+
+# Every course's first page of assignments in one round-trip instead of 1 + N REST calls
+COURSE_ASSIGNMENTS_QUERY = """
+query CourseAssignments {
+  allCourses {
+    _id
+    name
+    assignmentsConnection(first: 100) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        ...AssignmentFields
+      }
+    }
+  }
+}
+""" + _ASSIGNMENT_FIELDS
+
+# Later assignment pages for a course whose first page was full
+COURSE_ASSIGNMENTS_PAGE_QUERY = """
+query CourseAssignmentsPage($courseId: ID!, $after: String) {
+  course(id: $courseId) {
+    assignmentsConnection(first: 100, after: $after) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        ...AssignmentFields
+      }
+    }
+  }
+}
+""" + _ASSIGNMENT_FIELDS
+
+async def make_canvas_graphql_request(query: str, variables: dict = None):
+    """Make an authenticated request to the Canvas GraphQL API"""
+    if not CANVAS_API_KEY:
+        raise ValueError("CANVAS_API_KEY environment variable is required")
+    
+    response = await _send_request("/api/graphql", json={"query": query, "variables": variables or {}})
+    payload = orjson.loads(response.content)
+    if payload.get("errors") and not payload.get("data"):
+        raise ValueError(f"Canvas GraphQL error: {payload['errors']}")
+    return payload["data"]
+
+async def _all_assignment_nodes(course_id: str, connection: dict) -> list[dict]:
+    """Return every assignment node of a course, following the connection's cursor"""
+    nodes = list(connection.get("nodes") or [])
+    page_info = connection.get("pageInfo") or {}
+    while page_info.get("hasNextPage"):
+        data = await make_canvas_graphql_request(COURSE_ASSIGNMENTS_PAGE_QUERY, {
+            "courseId": course_id,
+            "after": page_info.get("endCursor")
+        })
+        connection = (data.get("course") or {}).get("assignmentsConnection") or {}
+        nodes.extend(connection.get("nodes") or [])
+        page_info = connection.get("pageInfo") or {}
+    return nodes
+
+def _assignment_from_node(node: dict) -> dict:
+    """Convert a GraphQL assignment node to the REST API's assignment shape"""
+    submissions = (node.get("submissionsConnection") or {}).get("nodes") or []
+    return {
+        "id": int(node["_id"]),
+        "name": node["name"],
+        "due_at": node.get("dueAt"),
+        "points_possible": node.get("pointsPossible"),
+        "html_url": node.get("htmlUrl") or "",
+        "description": node.get("description") or "",
+        "submission_types": [t.lower() for t in node.get("submissionTypes") or []],
+        # REST gets this from the upcoming/overdue buckets; GraphQL has no such filter
+        "has_submitted": any(s.get("submittedAt") for s in submissions)
+    }
+
+async def get_course_assignments_graphql():
+    """
+    Get the user's active courses with all of their assignments via GraphQL.
+    
+    Courses are limited to the same active enrollments as the REST path, and
+    assignments come back in the REST API's shape plus a has_submitted flag so
+    callers can apply the REST buckets' submitted rules. Returns None when
+    GraphQL is unavailable so the caller can fall back to per-course REST requests.
+    """
+    try:
+        data, courses = await asyncio.gather(
+            make_canvas_graphql_request(COURSE_ASSIGNMENTS_QUERY),
+            get_active_courses()
+        )
+        active = {course["id"]: course for course in courses if course.get("name")}
+        selected = [course for course in data.get("allCourses") or [] if int(course["_id"]) in active]
+        node_lists = await asyncio.gather(*(
+            _all_assignment_nodes(course["_id"], course.get("assignmentsConnection") or {})
+            for course in selected
+        ))
+    except httpx.HTTPStatusError as e:
+        if 400 <= e.response.status_code < 500:
+            return None
+        raise
+    except ValueError:
+        return None
+    
+    course_assignments = []
+    for course, nodes in zip(selected, node_lists):
+        course_id = int(course["_id"])
+        assignments = [_assignment_from_node(node) for node in nodes]
+        course_assignments.append(({"id": course_id, "name": active[course_id]["name"]}, assignments))
+    return course_assignments
+
+def _format_upcoming(rows: list[dict], today: datetime, end_date: datetime) -> list[dict]:
+    """Filter, format and sort raw upcoming-assignment rows as one DataFrame pass"""
+    if not rows:
+        return []
+    
+    # object dtype keeps ids and points as plain Python values in the output records
+    df = pd.DataFrame(rows, dtype=object)
+    due = pd.to_datetime(df.pop("due_at"), utc=True, errors="coerce")
+    # The assignments endpoint has no due-date range parameters, so this mask is what
+    # actually limits results to the requested window
+    in_range = (due >= today) & (due <= end_date)
+    df, due = df[in_range].copy(), due[in_range]
+    
+    desc = df["description"].fillna("")
+    df["description"] = desc.where(desc.str.len() <= 200, desc.str.slice(0, 200) + "...")
+    df["due_date"] = due.map(pd.Timestamp.isoformat)
+    df["due_date_formatted"] = due.dt.strftime("%B %d, %Y at %I:%M %p")
+    df["days_until_due"] = (due - today).dt.days
+    
+    return df.loc[due.sort_values(kind="stable").index].to_dict("records")
 
 @mcp.tool
 async def get_upcoming_assignments(days_ahead: int = 30) -> dict[str, Any]:
@@ -52,77 +505,55 @@ async def get_upcoming_assignments(days_ahead: int = 30) -> dict[str, Any]:
         Dictionary containing upcoming assignments with course info and due dates
     """
     try:
-        # Calculate the date range
-        today = datetime.now()
+        # Calculate the date range (Canvas due dates are UTC)
+        today = datetime.now(timezone.utc)
         end_date = today + timedelta(days=days_ahead)
         
-        # Get user's courses
-        courses = await make_canvas_request("/courses", {
-            "enrollment_state": "active",
-            "per_page": 100
-        })
+        def collect_rows(course, assignments):
+            # Keep raw rows; parsing, filtering and formatting happen in one vectorized pass
+            return [
+                {
+                    "course_name": course['name'],
+                    "course_id": course['id'],
+                    "assignment_name": assignment['name'],
+                    "assignment_id": assignment['id'],
+                    "due_at": assignment['due_at'],
+                    "points_possible": assignment.get('points_possible', 'N/A'),
+                    "submission_types": assignment.get('submission_types', []),
+                    "html_url": assignment.get('html_url', ''),
+                    "description": assignment.get('description')
+                }
+                for assignment in assignments
+                if assignment.get('due_at') and not assignment.get('has_submitted')
+            ]
         
-        all_assignments = []
-        
-        for course in courses:
-            if not course.get('name'):
-                continue
-                
-            course_id = course['id']
-            course_name = course['name']
-            
+        async def fetch_course(course):
             # Get assignments for this course
             try:
-                assignments = await make_canvas_request(
-                    f"/courses/{course_id}/assignments",
+                assignments = await get_all_paginated_data(
+                    f"/courses/{course['id']}/assignments",
                     {
                         "bucket": "upcoming",
-                        "per_page": 100,
                         "order_by": "due_at"
                     }
                 )
-                
-                for assignment in assignments:
-                    due_at = assignment.get('due_at')
-                    if not due_at:
-                        continue
-                    
-                    # Parse due date
-                    try:
-                        due_date = datetime.fromisoformat(due_at.replace('Z', '+00:00'))
-                        
-                        # Make sure all dates are timezone-aware for comparison
-                        if today.tzinfo is None:
-                            today = today.replace(tzinfo=due_date.tzinfo)
-                        if end_date.tzinfo is None:
-                            end_date = end_date.replace(tzinfo=due_date.tzinfo)
-                        
-                        # Only include assignments within our date range
-                        if today <= due_date <= end_date:
-                            assignment_info = {
-                                "course_name": course_name,
-                                "course_id": course_id,
-                                "assignment_name": assignment['name'],
-                                "assignment_id": assignment['id'],
-                                "due_date": due_date.isoformat(),
-                                "due_date_formatted": due_date.strftime("%B %d, %Y at %I:%M %p"),
-                                "points_possible": assignment.get('points_possible', 'N/A'),
-                                "submission_types": assignment.get('submission_types', []),
-                                "html_url": assignment.get('html_url', ''),
-                                "description": assignment.get('description', '')[:200] + "..." if assignment.get('description') and len(assignment.get('description', '')) > 200 else assignment.get('description', ''),
-                                "days_until_due": (due_date - today).days
-                            }
-                            all_assignments.append(assignment_info)
-                    except ValueError:
-                        # Skip assignments with invalid date formats
-                        continue
-                        
-            except httpx.HTTPStatusError as e:
+            except httpx.HTTPStatusError:
                 # Skip courses we can't access
-                continue
+                return []
+            
+            return collect_rows(course, assignments)
         
-        # Sort by due date
-        all_assignments.sort(key=lambda x: x['due_date'])
+        # Prefer a single GraphQL query; fall back to one REST request per course
+        course_assignments = await get_course_assignments_graphql()
+        if course_assignments is not None:
+            results = [collect_rows(course, assignments) for course, assignments in course_assignments]
+        else:
+            courses = await get_active_courses()
+            tasks = [fetch_course(c) for c in courses if c.get('name')]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        rows = list(itertools.chain.from_iterable(r for r in results if isinstance(r, list)))
+        
+        all_assignments = _format_upcoming(rows, today, end_date)
         
         return {
             "success": True,
@@ -151,19 +582,18 @@ async def get_assignments_by_course(course_id: int, days_ahead: int = 30) -> dic
         Dictionary containing assignments for the specified course
     """
     try:
-        # Calculate date range
-        today = datetime.now()
+        # Calculate date range (Canvas due dates are UTC)
+        today = datetime.now(timezone.utc)
         end_date = today + timedelta(days=days_ahead)
         
         # Get course info
         course = await make_canvas_request(f"/courses/{course_id}")
         
         # Get assignments
-        assignments = await make_canvas_request(
+        assignments = await get_all_paginated_data(
             f"/courses/{course_id}/assignments",
             {
                 "bucket": "upcoming",
-                "per_page": 100,
                 "order_by": "due_at"
             }
         )
@@ -176,15 +606,11 @@ async def get_assignments_by_course(course_id: int, days_ahead: int = 30) -> dic
                 continue
                 
             try:
-                due_date = datetime.fromisoformat(due_at.replace('Z', '+00:00'))
-                
-                # Make sure all dates are timezone-aware for comparison
-                if today.tzinfo is None:
-                    today = today.replace(tzinfo=due_date.tzinfo)
-                if end_date.tzinfo is None:
-                    end_date = end_date.replace(tzinfo=due_date.tzinfo)
+                due_date = ciso8601.parse_datetime(due_at)
                 
                 if today <= due_date <= end_date:
+                    desc = assignment.get('description') or ''
+                    desc = desc[:200] + "..." if len(desc) > 200 else desc
                     assignment_info = {
                         "assignment_name": assignment['name'],
                         "assignment_id": assignment['id'],
@@ -193,7 +619,7 @@ async def get_assignments_by_course(course_id: int, days_ahead: int = 30) -> dic
                         "points_possible": assignment.get('points_possible', 'N/A'),
                         "submission_types": assignment.get('submission_types', []),
                         "html_url": assignment.get('html_url', ''),
-                        "description": assignment.get('description', '')[:200] + "..." if assignment.get('description') and len(assignment.get('description', '')) > 200 else assignment.get('description', ''),
+                        "description": desc,
                         "days_until_due": (due_date - today).days
                     }
                     filtered_assignments.append(assignment_info)
@@ -227,62 +653,60 @@ async def get_overdue_assignments() -> dict[str, Any]:
         Dictionary containing overdue assignments
     """
     try:
-        # Get user's courses
-        courses = await make_canvas_request("/courses", {
-            "enrollment_state": "active",
-            "per_page": 100
-        })
+        today = datetime.now(timezone.utc)
         
-        overdue_assignments = []
-        today = datetime.now()
-        
-        for course in courses:
-            if not course.get('name'):
-                continue
+        def collect_overdue(course, assignments):
+            course_overdue = []
+            for assignment in assignments:
+                due_at = assignment.get('due_at')
+                # Submitted work is never overdue (the REST overdue bucket excludes it too)
+                if not due_at or assignment.get('has_submitted'):
+                    continue
                 
-            course_id = course['id']
-            course_name = course['name']
+                try:
+                    due_date = ciso8601.parse_datetime(due_at)
+                    
+                    # Check if assignment is overdue
+                    if due_date < today:
+                        assignment_info = {
+                            "course_name": course['name'],
+                            "course_id": course['id'],
+                            "assignment_name": assignment['name'],
+                            "assignment_id": assignment['id'],
+                            "due_date": due_date.isoformat(),
+                            "due_date_formatted": due_date.strftime("%B %d, %Y at %I:%M %p"),
+                            "points_possible": assignment.get('points_possible', 'N/A'),
+                            "html_url": assignment.get('html_url', ''),
+                            "days_overdue": (today - due_date).days
+                        }
+                        course_overdue.append(assignment_info)
+                except ValueError:
+                    continue
             
+            return course_overdue
+        
+        async def fetch_course(course):
             try:
-                assignments = await make_canvas_request(
-                    f"/courses/{course_id}/assignments",
+                assignments = await get_all_paginated_data(
+                    f"/courses/{course['id']}/assignments",
                     {
-                        "bucket": "past",
-                        "per_page": 100
+                        "bucket": "overdue"
                     }
                 )
-                
-                for assignment in assignments:
-                    due_at = assignment.get('due_at')
-                    if not due_at:
-                        continue
-                    
-                    try:
-                        due_date = datetime.fromisoformat(due_at.replace('Z', '+00:00'))
-                        
-                        # Make sure all dates are timezone-aware for comparison
-                        if today.tzinfo is None:
-                            today = today.replace(tzinfo=due_date.tzinfo)
-                        
-                        # Check if assignment is overdue
-                        if due_date < today:
-                            assignment_info = {
-                                "course_name": course_name,
-                                "course_id": course_id,
-                                "assignment_name": assignment['name'],
-                                "assignment_id": assignment['id'],
-                                "due_date": due_date.isoformat(),
-                                "due_date_formatted": due_date.strftime("%B %d, %Y at %I:%M %p"),
-                                "points_possible": assignment.get('points_possible', 'N/A'),
-                                "html_url": assignment.get('html_url', ''),
-                                "days_overdue": (today - due_date).days
-                            }
-                            overdue_assignments.append(assignment_info)
-                    except ValueError:
-                        continue
-                        
             except httpx.HTTPStatusError:
-                continue
+                return []
+            
+            return collect_overdue(course, assignments)
+        
+        # Prefer a single GraphQL query; fall back to one REST request per course
+        course_assignments = await get_course_assignments_graphql()
+        if course_assignments is not None:
+            results = [collect_overdue(course, assignments) for course, assignments in course_assignments]
+        else:
+            courses = await get_active_courses()
+            tasks = [fetch_course(c) for c in courses if c.get('name')]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        overdue_assignments = list(itertools.chain.from_iterable(r for r in results if isinstance(r, list)))
         
         # Sort by most overdue first
         overdue_assignments.sort(key=lambda x: x['due_date'])
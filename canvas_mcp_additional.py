@@ -4,26 +4,314 @@ This file contains the remaining tools that couldn't fit in the main canvas_mcp.
 """
 
 import asyncio
+import heapq
 import os
-import json
+import logging
+import re
 import time
-import aiofiles
+import numpy as np
+from contextlib import aclosing
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Union
-from dateutil import parser as date_parser
-from fuzzywuzzy import fuzz
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from rapidfuzz import fuzz, process
 import httpx
 from fastmcp import FastMCP
 
 # Import utilities from main file
 from canvas_mcp import (
-    make_canvas_request, get_all_paginated_data, format_response,
-    parse_date_string, calculate_days_until_due, is_overdue
+    make_canvas_request, get_all_paginated_data, iter_paginated_data, get_active_courses, format_response,
+    parse_date_string
 )
+from study_plan_core import allocate_segments
+from grades_core import GRADE_LETTERS, GRADE_THRESHOLDS, GradeTotals
+
+log = logging.getLogger("canvas_mcp_additional")
 
 # Initialize additional MCP server for additional tools
 mcp_additional = FastMCP("Canvas Study Assistant - Additional Tools")
 
+# Title keywords marking an assessment, and the subset that earns a confidence boost.
+# Plain alternations keep the old substring semantics ("tests", "midterm2" still match).
+TEST_KW_RE = re.compile(r"exam|test|quiz|midterm|final|assessment")
+HIGH_VALUE_KEYWORDS = frozenset({"exam", "midterm", "final"})
+LECTURE_KW_RE = re.compile(r"lecture|notes|slides|presentation|class")
+
+# Date-context phrases: weekday names map to datetime.weekday(), relative phrases to days ahead
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+RELATIVE_DAYS = {"next week": 7, "this week": 3, "tomorrow": 1, "today": 0}
+
+# Letter grades calculate_grade_impact reports minimum scores for (A down to D-) and their cut-offs
+MIN_SCORE_LETTERS = np.array(GRADE_LETTERS[-2:0:-1])
+MIN_SCORE_THRESHOLDS = np.array(GRADE_THRESHOLDS[-2::-1], dtype=float)
+
+# Number of ranked candidates identify_test_by_context returns alongside the best match
+MAX_TEST_CANDIDATES = 10
+
+def _within(items: List[Dict[str, Any]], field: str, start: datetime, end: datetime = None) -> List[tuple]:
+    """
+    Return (item, parsed_date) for items whose ISO `field` falls in [start, end].
+    
+    Dates are parsed once and the window is applied as a single numpy mask;
+    items with a missing or malformed date are dropped.
+    """
+    dated = [(item, parse_date_string(item.get(field))) for item in items]
+    dated = [pair for pair in dated if pair[1]]
+    if not dated:
+        return []
+    stamps = np.fromiter((d.timestamp() for _, d in dated), dtype=float, count=len(dated))
+    mask = stamps >= start.timestamp()
+    if end is not None:
+        mask &= stamps <= end.timestamp()
+    return [dated[i] for i in np.flatnonzero(mask)]
+
+def _allocate_days(study_topics: List[Dict[str, Any]], days: int, hours_per_day: float, first_day: datetime) -> List[Dict[str, Any]]:
+    """
+    Turn the per-day topic segments from study_plan_core into schedule entries.
+    
+    A topic cut by a day boundary lists a proportional slice of its items on the
+    days before the one it finishes on.
+    """
+    # No study time means no day can hold a topic; the kernel divides by hours_per_day
+    if hours_per_day <= 0:
+        segments = [[] for _ in range(days)]
+    else:
+        segments = allocate_segments([float(topic["estimated_hours"]) for topic in study_topics], days, float(hours_per_day))
+    
+    study_schedule = []
+    for day, day_segments in enumerate(segments):
+        current_day = first_day + timedelta(days=day)
+        day_topics = []
+        for topic_index, seg_hours, finishes in day_segments:
+            topic = study_topics[topic_index]
+            day_topics.append({
+                "name": topic["name"],
+                "hours": seg_hours,
+                "items": topic["items"] if finishes else topic["items"][:int(seg_hours * 2)]  # Rough estimate
+            })
+        study_schedule.append({
+            "date": current_day.strftime("%Y-%m-%d"),
+            "day_name": current_day.strftime("%A"),
+            "topics": day_topics,
+            "total_hours": sum(topic["hours"] for topic in day_topics)
+        })
+    return study_schedule
+
+def _test_candidate(kind: str, item: Dict[str, Any], course_name: str, course_id: str,
+                    when: datetime, confidence: float) -> Dict[str, Any]:
+    """Build the candidate dict identify_test_by_context returns for an assignment or event"""
+    candidate = {
+        "id": str(item['id']),
+        "name": item['title'],
+        "course_name": course_name,
+        "course_id": course_id,
+        "due_at": when.isoformat(),
+        "points_possible": item.get('points_possible', 0) if kind == "assignment" else 0,
+        "type": kind,
+        "html_url": item.get('html_url', ''),
+        "description": item.get('description', ''),
+    }
+    if kind == "event":
+        candidate["location"] = item.get('location_name', '')
+    candidate["confidence_score"] = confidence
+    return candidate
+
+# Minimum fuzz.partial_ratio (0-100) for a title to count as a practice-resource match
+PRACTICE_MATCH_THRESHOLD = 80
+
+def _rank_matches(topic_lower: str, titles: List[str], bodies: List[Optional[str]] = None) -> List[tuple]:
+    """
+    Find items matching a topic and give each a relevance score.
+    
+    Verbatim hits in the title or body score 1.0 without fuzzy matching. Titles
+    sharing at least one topic word are scored together in one batched RapidFuzz
+    call; everything else is skipped.
+    
+    Returns (index, relevance_score) pairs.
+    """
+    topic_tokens = topic_lower.split()
+    # Case-insensitive search avoids lowering every (often multi-KB HTML) body
+    topic_re = re.compile(re.escape(topic_lower), re.IGNORECASE)
+    matches = []
+    near_misses = []
+    for i, title in enumerate(titles):
+        if topic_re.search(title) or (bodies and bodies[i] and topic_re.search(bodies[i])):
+            matches.append((i, 1.0))
+            continue
+        title_lower = title.lower()
+        if any(token in title_lower for token in topic_tokens):
+            near_misses.append((i, title_lower))
+    
+    if near_misses:
+        scores = process.cdist(
+            [topic_lower], [title for _, title in near_misses], scorer=fuzz.partial_ratio, workers=-1
+        )[0]
+        matches.extend(
+            (i, float(score) / 100.0)
+            for (i, _), score in zip(near_misses, scores)
+            if score >= PRACTICE_MATCH_THRESHOLD
+        )
+    return matches
+
+def _search_window(date_context: str) -> tuple:
+    """Resolve a natural-language date context to (target_date, window_start, window_end)"""
+    context_lower = date_context.lower()
+    today = datetime.now(timezone.utc)
+    weekday = next((day for name, day in WEEKDAYS.items() if name in context_lower), None)
+    if weekday is not None:
+        # Next occurrence of that weekday, never today
+        days_ahead = (weekday - today.weekday()) % 7 or 7
+    else:
+        days_ahead = next((days for phrase, days in RELATIVE_DAYS.items() if phrase in context_lower), 7)
+    target_date = today + timedelta(days=days_ahead)
+    
+    return target_date, target_date - timedelta(days=2), target_date + timedelta(days=2)
+
+async def _courses_for_hint(subject_hint: Optional[str]) -> List[Dict[str, Any]]:
+    """Active courses, narrowed to those whose name contains the subject hint"""
+    courses = await get_active_courses()
+    if subject_hint:
+        subject_hint_lower = subject_hint.lower()
+        courses = [c for c in courses if subject_hint_lower in c.get('name', '').lower()]
+    return courses
+
+def _score_course(course: Dict[str, Any], assignments: List[Dict[str, Any]], events: List[Dict[str, Any]],
+                  target_date: datetime, start_date: datetime, end_date: datetime,
+                  subject_hint_lower: Optional[str]) -> List[tuple]:
+    """
+    Score one course's assignments and calendar events as test candidates.
+    
+    Returns (confidence, source) pairs; source holds the arguments _test_candidate needs.
+    """
+    course_name = course['name']
+    course_id_str = str(course['id'])
+    scored = []
+    
+    # Check assignments
+    for assignment, due_date in _within(assignments, 'due_at', start_date, end_date):
+        title_lower = assignment['title'].lower()
+        # One scan finds every keyword, covering both the match and the boost
+        keyword_hits = TEST_KW_RE.findall(title_lower)
+        if keyword_hits:
+            # Calculate confidence score
+            confidence = 0.5  # Base confidence
+            
+            # Boost confidence for exact date match
+            if abs((due_date - target_date).days) <= 1:
+                confidence += 0.3
+            
+            # Boost confidence for subject match
+            if subject_hint_lower and subject_hint_lower in title_lower:
+                confidence += 0.2
+            
+            # Boost confidence for test keywords
+            if not HIGH_VALUE_KEYWORDS.isdisjoint(keyword_hits):
+                confidence += 0.2
+            
+            scored.append((min(confidence, 1.0), ("assignment", assignment, course_name, course_id_str, due_date)))
+    
+    # Check calendar events
+    for event, event_date in _within(events, 'start_at', start_date, end_date):
+        title_lower = event['title'].lower()
+        if TEST_KW_RE.search(title_lower):
+            # Calculate confidence score
+            confidence = 0.4  # Base confidence for events
+            
+            # Boost confidence for exact date match
+            if abs((event_date - target_date).days) <= 1:
+                confidence += 0.3
+            
+            # Boost confidence for subject match
+            if subject_hint_lower and subject_hint_lower in title_lower:
+                confidence += 0.2
+            
+            scored.append((min(confidence, 1.0), ("event", event, course_name, course_id_str, event_date)))
+    
+    return scored
+
+async def _iter_course_data(courses: List[Dict[str, Any]], start_date: datetime,
+                            end_date: datetime) -> AsyncIterator[tuple]:
+    """
+    Fetch every course concurrently and yield (course_index, assignments, events) as each arrives.
+    
+    Courses whose fetch fails are logged and skipped; closing the iterator
+    early cancels fetches that are still outstanding.
+    """
+    async def fetch_course(index, course):
+        course_id = course['id']
+        try:
+            # Assignments and calendar events are independent, so fetch them together
+            result = await asyncio.gather(
+                get_all_paginated_data(
+                    f"/courses/{course_id}/assignments",
+                    {
+                        "include[]": ["submission"],
+                        # Let Canvas drop past and undated work; the date window is still checked locally
+                        "bucket": "upcoming",
+                        "order_by": "due_at"
+                    },
+                    cache_ttl=300
+                ),
+                get_all_paginated_data("/calendar_events", {
+                    "context_codes": [f"course_{course_id}"],
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                }, cache_ttl=300)
+            )
+        except Exception as e:
+            return index, e
+        return index, result
+    
+    tasks = [asyncio.ensure_future(fetch_course(i, c)) for i, c in enumerate(courses)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, result = await next_done
+            if isinstance(result, Exception):
+                log.warning("Error processing course %s: %s", courses[index]['id'], result)
+                continue
+            yield index, *result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def _iter_course_candidates(courses: List[Dict[str, Any]], target_date: datetime, start_date: datetime,
+                                  end_date: datetime, subject_hint_lower: Optional[str]) -> AsyncIterator[tuple]:
+    """Yield (course_index, scored candidates) for each course as its data arrives"""
+    async with aclosing(_iter_course_data(courses, start_date, end_date)) as course_data:
+        async for index, assignments, events in course_data:
+            try:
+                scored = _score_course(courses[index], assignments, events,
+                                       target_date, start_date, end_date, subject_hint_lower)
+            except Exception as e:
+                log.warning("Error processing course %s: %s", courses[index]['id'], e)
+                scored = []
+            yield index, scored
+
+async def identify_test_by_context_stream(date_context: str, subject_hint: str = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream increasingly likely test matches as each course's data arrives.
+    
+    Args:
+        date_context: Natural language date context (e.g., "Thursday's test", "next week's exam")
+        subject_hint: Subject hint (e.g., "calc", "physics")
+    
+    Yields:
+        Candidate dictionaries, each with a higher confidence score than the one before
+    """
+    target_date, start_date, end_date = _search_window(date_context)
+    courses = await _courses_for_hint(subject_hint)
+    subject_hint_lower = subject_hint.lower() if subject_hint else None
+    
+    best_score = -1.0
+    async with aclosing(_iter_course_candidates(courses, target_date, start_date, end_date, subject_hint_lower)) as batches:
+        async for _, scored in batches:
+            for confidence, source in scored:
+                if confidence > best_score:
+                    best_score = confidence
+                    yield _test_candidate(*source, confidence)
+
 # ============================================================================
 # SMART STUDY TOOLS
 # ============================================================================
@@ -43,154 +331,41 @@ async def identify_test_by_context(date_context: str, subject_hint: str = None)
     start_time = time.time()
     
     try:
-        # Parse date context
-        target_date = None
-        if "thursday" in date_context.lower():
-            today = datetime.now(timezone.utc)
-            days_ahead = 3 - today.weekday()  # Thursday is 3
-            if days_ahead <= 0:
-                days_ahead += 7
-            target_date = today + timedelta(days=days_ahead)
-        elif "friday" in date_context.lower():
-            today = datetime.now(timezone.utc)
-            days_ahead = 4 - today.weekday()  # Friday is 4
-            if days_ahead <= 0:
-                days_ahead += 7
-            target_date = today + timedelta(days=days_ahead)
-        elif "next week" in date_context.lower():
-            target_date = datetime.now(timezone.utc) + timedelta(days=7)
-        elif "this week" in date_context.lower():
-            target_date = datetime.now(timezone.utc) + timedelta(days=3)
-        else:
-            target_date = datetime.now(timezone.utc) + timedelta(days=7)
-        
-        # Calculate search window
-        start_date = target_date - timedelta(days=2)
-        end_date = target_date + timedelta(days=2)
-        
-        # Get courses
-        courses = await get_all_paginated_data("/courses", {
-            "enrollment_state": "active"
-        }, cache_ttl=1800)
-        
-        # Filter courses by subject hint if provided
-        if subject_hint:
-            subject_hint_lower = subject_hint.lower()
-            courses = [c for c in courses if subject_hint_lower in c.get('name', '').lower()]
-        
-        candidates = []
-        
-        for course in courses:
-            course_id = course['id']
-            course_name = course['name']
-            
-            try:
-                # Get assignments
-                assignments = await get_all_paginated_data(
-                    f"/courses/{course_id}/assignments",
-                    {
-                        "include[]": ["submission"]
-                    },
-                    cache_ttl=300
-                )
+        target_date, start_date, end_date = _search_window(date_context)
+        courses = await _courses_for_hint(subject_hint)
+        subject_hint_lower = subject_hint.lower() if subject_hint else None
+        
+        # Bounded min-heap of the best candidates seen so far. Ties prefer earlier courses,
+        # then earlier items within the course, so the ranking doesn't depend on which
+        # fetch finished first. Only the survivors are turned into dicts.
+        heap = []
+        reported = set()
+        total_scanned = 0
+        
+        async with aclosing(_iter_course_candidates(courses, target_date, start_date, end_date, subject_hint_lower)) as batches:
+            async for course_index, scored in batches:
+                reported.add(course_index)
+                total_scanned += len(scored)
+                for item_index, (confidence, source) in enumerate(scored):
+                    entry = (confidence, -course_index, -item_index, source)
+                    if len(heap) < MAX_TEST_CANDIDATES:
+                        heapq.heappush(heap, entry)
+                    else:
+                        heapq.heappushpop(heap, entry)
                 
-                # Get calendar events
-                events = await get_all_paginated_data("/calendar_events", {
-                    "context_codes": [f"course_{course_id}"],
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat()
-                }, cache_ttl=300)
-                
-                # Check assignments
-                test_keywords = ['exam', 'test', 'quiz', 'midterm', 'final', 'assessment']
-                
-                for assignment in assignments:
-                    due_at = assignment.get('due_at')
-                    if not due_at:
-                        continue
-                    
-                    due_date = parse_date_string(due_at)
-                    if not due_date or not (start_date <= due_date <= end_date):
-                        continue
-                    
-                    title_lower = assignment['title'].lower()
-                    if any(keyword in title_lower for keyword in test_keywords):
-                        # Calculate confidence score
-                        confidence = 0.5  # Base confidence
-                        
-                        # Boost confidence for exact date match
-                        if abs((due_date - target_date).days) <= 1:
-                            confidence += 0.3
-                        
-                        # Boost confidence for subject match
-                        if subject_hint and subject_hint_lower in title_lower:
-                            confidence += 0.2
-                        
-                        # Boost confidence for test keywords
-                        if any(keyword in title_lower for keyword in ['exam', 'midterm', 'final']):
-                            confidence += 0.2
-                        
-                        candidate = {
-                            "id": str(assignment['id']),
-                            "name": assignment['title'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "due_at": due_date.isoformat(),
-                            "points_possible": assignment.get('points_possible', 0),
-                            "type": "assignment",
-                            "html_url": assignment.get('html_url', ''),
-                            "description": assignment.get('description', ''),
-                            "confidence_score": min(confidence, 1.0)
-                        }
-                        candidates.append(candidate)
-                
-                # Check calendar events
-                for event in events:
-                    start_at = event.get('start_at')
-                    if not start_at:
-                        continue
-                    
-                    event_date = parse_date_string(start_at)
-                    if not event_date or not (start_date <= event_date <= end_date):
-                        continue
-                    
-                    title_lower = event['title'].lower()
-                    if any(keyword in title_lower for keyword in test_keywords):
-                        # Calculate confidence score
-                        confidence = 0.4  # Base confidence for events
-                        
-                        # Boost confidence for exact date match
-                        if abs((event_date - target_date).days) <= 1:
-                            confidence += 0.3
-                        
-                        # Boost confidence for subject match
-                        if subject_hint and subject_hint_lower in title_lower:
-                            confidence += 0.2
-                        
-                        candidate = {
-                            "id": str(event['id']),
-                            "name": event['title'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "due_at": event_date.isoformat(),
-                            "points_possible": 0,
-                            "type": "event",
-                            "html_url": event.get('html_url', ''),
-                            "description": event.get('description', ''),
-                            "location": event.get('location_name', ''),
-                            "confidence_score": min(confidence, 1.0)
-                        }
-                        candidates.append(candidate)
-                        
-            except Exception as e:
-                print(f"Error processing course {course_id}: {e}")
-                continue
+                # Once every kept candidate is a full-confidence match and every course that
+                # could tie ahead of them has reported, the remaining courses can't change the result
+                if len(heap) == MAX_TEST_CANDIDATES and heap[0][0] >= 1.0 \
+                        and reported.issuperset(range(-heap[0][1])):
+                    break
         
-        # Sort by confidence score
-        candidates.sort(key=lambda x: x['confidence_score'], reverse=True)
+        top_candidates = [
+            _test_candidate(*source, confidence)
+            for confidence, _, _, source in sorted(heap, key=lambda entry: entry[:3], reverse=True)
+        ]
         
         # Get the best match
-        best_match = candidates[0] if candidates else None
+        best_match = top_candidates[0] if top_candidates else None
         
         processing_time = time.time() - start_time
         
@@ -198,8 +373,9 @@ async def identify_test_by_context(date_context: str, subject_hint: str = None)
             success=True,
             data={
                 "best_match": best_match,
-                "all_candidates": candidates,
-                "total_candidates": len(candidates),
+                "all_candidates": top_candidates,
+                "total_candidates": len(top_candidates),
+                "total_scanned": total_scanned,
                 "search_context": {
                     "date_context": date_context,
                     "subject_hint": subject_hint,
@@ -223,6 +399,85 @@ async def identify_test_by_context(date_context: str, subject_hint: str = None)
             error=f"Failed to identify test by context: {str(e)}"
         )
 
+@mcp_additional.tool()
+async def identify_tests_by_contexts(queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Identify several tests in one pass, fetching each course only once.
+    
+    Args:
+        queries: List of {"date_context": ..., "subject_hint": ...} dictionaries
+    
+    Returns:
+        Dictionary containing the best match for each query, in query order
+    """
+    start_time = time.time()
+    
+    try:
+        windows = [_search_window(query["date_context"]) for query in queries]
+        hints = [(query.get("subject_hint") or "").lower() or None for query in queries]
+        
+        # Only courses that some query could match, fetched over the union of all windows
+        courses = [
+            c for c in await get_active_courses()
+            if any(hint is None or hint in c.get('name', '').lower() for hint in hints)
+        ]
+        best = [None] * len(queries)
+        scanned = [0] * len(queries)
+        
+        if windows:
+            union_start = min(window[1] for window in windows)
+            union_end = max(window[2] for window in windows)
+            async with aclosing(_iter_course_data(courses, union_start, union_end)) as course_data:
+                async for course_index, assignments, events in course_data:
+                    course = courses[course_index]
+                    name_lower = course.get('name', '').lower()
+                    for i, ((target_date, start_date, end_date), hint) in enumerate(zip(windows, hints)):
+                        if hint and hint not in name_lower:
+                            continue
+                        try:
+                            scored = _score_course(course, assignments, events, target_date, start_date, end_date, hint)
+                        except Exception as e:
+                            log.warning("Error processing course %s: %s", course['id'], e)
+                            continue
+                        for confidence, source in scored:
+                            # Same tie-break as identify_test_by_context: earlier course, then earlier item
+                            entry = (confidence, -course_index, -scanned[i], source)
+                            scanned[i] += 1
+                            if best[i] is None or entry[:3] > best[i][:3]:
+                                best[i] = entry
+        
+        results = []
+        for i, query in enumerate(queries):
+            results.append({
+                "query_id": query.get("query_id", i),
+                "date_context": query["date_context"],
+                "subject_hint": query.get("subject_hint"),
+                "target_date": windows[i][0].isoformat(),
+                "best_match": _test_candidate(*best[i][3], best[i][0]) if best[i] else None,
+                "total_scanned": scanned[i]
+            })
+        
+        processing_time = time.time() - start_time
+        
+        return format_response(
+            success=True,
+            data={
+                "results": results,
+                "total_queries": len(queries)
+            },
+            metadata={
+                "api_calls_made": len(courses) * 2 + 1,
+                "processing_time": processing_time,
+                "cache_hit": False
+            }
+        )
+        
+    except Exception as e:
+        return format_response(
+            success=False,
+            error=f"Failed to identify tests by contexts: {str(e)}"
+        )
+
 @mcp_additional.tool()
 async def gather_study_materials(exam_id: str, course_id: str, weeks_back: int = 4) -> Dict[str, Any]:
     """
@@ -239,53 +494,47 @@ async def gather_study_materials(exam_id: str, course_id: str, weeks_back: int =
     start_time = time.time()
     
     try:
-        # Get exam details
-        exam = await make_canvas_request(
-            f"/courses/{course_id}/assignments/{exam_id}",
-            cache_ttl=300
+        # None of these requests depend on each other, so issue them together
+        exam, modules, files, announcements, discussions = await asyncio.gather(
+            make_canvas_request(
+                f"/courses/{course_id}/assignments/{exam_id}",
+                cache_ttl=300
+            ),
+            get_all_paginated_data(
+                f"/courses/{course_id}/modules",
+                {
+                    "include[]": ["items", "content_details"]
+                },
+                cache_ttl=1800
+            ),
+            get_all_paginated_data(
+                f"/courses/{course_id}/files",
+                cache_ttl=1800
+            ),
+            get_all_paginated_data(
+                f"/courses/{course_id}/discussion_topics",
+                {
+                    "only_announcements": True,
+                    "order_by": "posted_at"
+                },
+                cache_ttl=300
+            ),
+            get_all_paginated_data(
+                f"/courses/{course_id}/discussion_topics",
+                {
+                    "order_by": "posted_at"
+                },
+                cache_ttl=300
+            )
         )
         
         # Calculate date range
         exam_date = parse_date_string(exam.get('due_at'))
         if not exam_date:
-            exam_date = datetime.now() + timedelta(days=7)
+            exam_date = datetime.now(timezone.utc) + timedelta(days=7)
         
         start_date = exam_date - timedelta(weeks=weeks_back)
         
-        # Get course modules
-        modules = await get_all_paginated_data(
-            f"/courses/{course_id}/modules",
-            {
-                "include[]": ["items", "content_details"]
-            },
-            cache_ttl=1800
-        )
-        
-        # Get course files
-        files = await get_all_paginated_data(
-            f"/courses/{course_id}/files",
-            cache_ttl=1800
-        )
-        
-        # Get announcements
-        announcements = await get_all_paginated_data(
-            f"/courses/{course_id}/discussion_topics",
-            {
-                "only_announcements": True,
-                "order_by": "posted_at"
-            },
-            cache_ttl=300
-        )
-        
-        # Get discussions
-        discussions = await get_all_paginated_data(
-            f"/courses/{course_id}/discussion_topics",
-            {
-                "order_by": "posted_at"
-            },
-            cache_ttl=300
-        )
-        
         # Organize materials
         study_materials = {
             "exam_info": {
@@ -328,48 +577,43 @@ async def gather_study_materials(exam_id: str, course_id: str, weeks_back: int =
                 })
         
         # Process files (filter for lecture materials)
-        lecture_keywords = ['lecture', 'notes', 'slides', 'presentation', 'class']
-        for file in files:
+        for file, _ in _within(files, 'created_at', start_date):
             if not file.get('display_name'):
                 continue
             
-            file_date = parse_date_string(file.get('created_at'))
-            if file_date and file_date >= start_date:
-                display_name_lower = file['display_name'].lower()
-                if any(keyword in display_name_lower for keyword in lecture_keywords):
-                    study_materials["lecture_files"].append({
-                        "id": str(file['id']),
-                        "name": file['display_name'],
-                        "url": file.get('url', ''),
-                        "size": file.get('size', 0),
-                        "created_at": file.get('created_at'),
-                        "content_type": file.get('content-type', '')
-                    })
-        
-        # Process announcements
-        for announcement in announcements:
-            posted_at = parse_date_string(announcement.get('posted_at'))
-            if posted_at and posted_at >= start_date:
-                study_materials["announcements"].append({
-                    "id": str(announcement['id']),
-                    "title": announcement['title'],
-                    "message": announcement.get('message', ''),
-                    "posted_at": announcement.get('posted_at'),
-                    "html_url": announcement.get('html_url', '')
+            display_name_lower = file['display_name'].lower()
+            if LECTURE_KW_RE.search(display_name_lower):
+                study_materials["lecture_files"].append({
+                    "id": str(file['id']),
+                    "name": file['display_name'],
+                    "url": file.get('url', ''),
+                    "size": file.get('size', 0),
+                    "created_at": file.get('created_at'),
+                    "content_type": file.get('content-type', '')
                 })
         
-        # Process discussions
-        for discussion in discussions:
-            posted_at = parse_date_string(discussion.get('posted_at'))
-            if posted_at and posted_at >= start_date:
-                study_materials["discussions"].append({
-                    "id": str(discussion['id']),
-                    "title": discussion['title'],
-                    "message": discussion.get('message', ''),
-                    "posted_at": discussion.get('posted_at'),
-                    "html_url": discussion.get('html_url', ''),
-                    "discussion_type": discussion.get('discussion_type', 'side_comment')
-                })
+        # Process announcements
+        for announcement, _ in _within(announcements, 'posted_at', start_date):
+            study_materials["announcements"].append({
+                "id": str(announcement['id']),
+                "title": announcement['title'],
+                "message": announcement.get('message', ''),
+                "posted_at": announcement.get('posted_at'),
+                "html_url": announcement.get('html_url', '')
+            })
+        
+        # Process discussions (announcements are listed separately above)
+        for discussion, _ in _within(discussions, 'posted_at', start_date):
+            if discussion.get('is_announcement'):
+                continue
+            study_materials["discussions"].append({
+                "id": str(discussion['id']),
+                "title": discussion['title'],
+                "message": discussion.get('message', ''),
+                "posted_at": discussion.get('posted_at'),
+                "html_url": discussion.get('html_url', ''),
+                "discussion_type": discussion.get('discussion_type', 'side_comment')
+            })
         
         processing_time = time.time() - start_time
         
@@ -480,48 +724,7 @@ async def create_study_plan(exam_date: str, course_id: str, hours_available: flo
                 topic["estimated_hours"] *= scale_factor
         
         # Distribute topics across days
-        study_schedule = []
-        current_day = today
-        topic_index = 0
-        
-        for day in range(days_until_exam):
-            day_schedule = {
-                "date": current_day.strftime("%Y-%m-%d"),
-                "day_name": current_day.strftime("%A"),
-                "topics": [],
-                "total_hours": 0
-            }
-            
-            day_hours_used = 0
-            
-            while day_hours_used < hours_available and topic_index < len(study_topics):
-                topic = study_topics[topic_index]
-                remaining_topic_hours = topic["estimated_hours"]
-                
-                if remaining_topic_hours <= (hours_available - day_hours_used):
-                    # Can complete entire topic today
-                    day_schedule["topics"].append({
-                        "name": topic["name"],
-                        "hours": remaining_topic_hours,
-                        "items": topic["items"]
-                    })
-                    day_hours_used += remaining_topic_hours
-                    topic_index += 1
-                else:
-                    # Partial topic today
-                    partial_hours = hours_available - day_hours_used
-                    day_schedule["topics"].append({
-                        "name": topic["name"],
-                        "hours": partial_hours,
-                        "items": topic["items"][:int(partial_hours * 2)]  # Rough estimate
-                    })
-                    topic["estimated_hours"] -= partial_hours
-                    day_hours_used = hours_available
-                    break
-            
-            day_schedule["total_hours"] = day_hours_used
-            study_schedule.append(day_schedule)
-            current_day += timedelta(days=1)
+        study_schedule = _allocate_days(study_topics, days_until_exam, hours_available, today)
         
         processing_time = time.time() - start_time
         
@@ -573,9 +776,7 @@ async def get_practice_resources(topic: str, course_id: str = None) -> Dict[str,
         if course_id:
             courses = [{"id": course_id, "name": "Unknown Course"}]
         else:
-            courses = await get_all_paginated_data("/courses", {
-                "enrollment_state": "active"
-            }, cache_ttl=1800)
+            courses = await get_active_courses()
         
         practice_resources = {
             "topic": topic,
@@ -588,102 +789,99 @@ async def get_practice_resources(topic: str, course_id: str = None) -> Dict[str,
         
         topic_lower = topic.lower()
         
-        for course in courses:
+        async def fetch_course(course):
+            course_id = course['id']
+            # The four resource endpoints are independent, so fetch them together
+            return await asyncio.gather(
+                get_all_paginated_data(f"/courses/{course_id}/assignments", cache_ttl=300),
+                get_all_paginated_data(f"/courses/{course_id}/quizzes", cache_ttl=300),
+                get_all_paginated_data(f"/courses/{course_id}/discussion_topics", cache_ttl=300),
+                get_all_paginated_data(f"/courses/{course_id}/files", cache_ttl=1800)
+            )
+        
+        results = await asyncio.gather(*(fetch_course(c) for c in courses), return_exceptions=True)
+        
+        for course, result in zip(courses, results):
             course_id = course['id']
             course_name = course['name']
             
+            if isinstance(result, Exception):
+                log.warning("Error searching course %s: %s", course_id, result)
+                continue
+            
             try:
-                # Search assignments
-                assignments = await get_all_paginated_data(
-                    f"/courses/{course_id}/assignments",
-                    cache_ttl=300
-                )
+                assignments, quizzes, discussions, files = result
                 
-                for assignment in assignments:
-                    title_lower = assignment['title'].lower()
-                    description_lower = assignment.get('description', '').lower()
-                    
-                    if topic_lower in title_lower or topic_lower in description_lower:
-                        practice_resources["assignments"].append({
-                            "id": str(assignment['id']),
-                            "title": assignment['title'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "description": assignment.get('description', ''),
-                            "points_possible": assignment.get('points_possible', 0),
-                            "html_url": assignment.get('html_url', ''),
-                            "relevance_score": fuzz.partial_ratio(topic_lower, title_lower) / 100.0
-                        })
+                # Search assignments
+                for i, score in _rank_matches(
+                    topic_lower,
+                    [a['title'] for a in assignments],
+                    [a.get('description') for a in assignments]
+                ):
+                    assignment = assignments[i]
+                    practice_resources["assignments"].append({
+                        "id": str(assignment['id']),
+                        "title": assignment['title'],
+                        "course_name": course_name,
+                        "course_id": str(course_id),
+                        "description": assignment.get('description', ''),
+                        "points_possible": assignment.get('points_possible', 0),
+                        "html_url": assignment.get('html_url', ''),
+                        "relevance_score": score
+                    })
                 
                 # Search quizzes
-                quizzes = await get_all_paginated_data(
-                    f"/courses/{course_id}/quizzes",
-                    cache_ttl=300
-                )
-                
-                for quiz in quizzes:
-                    title_lower = quiz['title'].lower()
-                    description_lower = quiz.get('description', '').lower()
-                    
-                    if topic_lower in title_lower or topic_lower in description_lower:
-                        practice_resources["quizzes"].append({
-                            "id": str(quiz['id']),
-                            "title": quiz['title'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "description": quiz.get('description', ''),
-                            "points_possible": quiz.get('points_possible', 0),
-                            "html_url": quiz.get('html_url', ''),
-                            "relevance_score": fuzz.partial_ratio(topic_lower, title_lower) / 100.0
-                        })
+                for i, score in _rank_matches(
+                    topic_lower,
+                    [q['title'] for q in quizzes],
+                    [q.get('description') for q in quizzes]
+                ):
+                    quiz = quizzes[i]
+                    practice_resources["quizzes"].append({
+                        "id": str(quiz['id']),
+                        "title": quiz['title'],
+                        "course_name": course_name,
+                        "course_id": str(course_id),
+                        "description": quiz.get('description', ''),
+                        "points_possible": quiz.get('points_possible', 0),
+                        "html_url": quiz.get('html_url', ''),
+                        "relevance_score": score
+                    })
                 
                 # Search discussions
-                discussions = await get_all_paginated_data(
-                    f"/courses/{course_id}/discussion_topics",
-                    cache_ttl=300
-                )
-                
-                for discussion in discussions:
-                    title_lower = discussion['title'].lower()
-                    message_lower = discussion.get('message', '').lower()
-                    
-                    if topic_lower in title_lower or topic_lower in message_lower:
-                        practice_resources["discussions"].append({
-                            "id": str(discussion['id']),
-                            "title": discussion['title'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "message": discussion.get('message', ''),
-                            "html_url": discussion.get('html_url', ''),
-                            "relevance_score": fuzz.partial_ratio(topic_lower, title_lower) / 100.0
-                        })
+                for i, score in _rank_matches(
+                    topic_lower,
+                    [d['title'] for d in discussions],
+                    [d.get('message') for d in discussions]
+                ):
+                    discussion = discussions[i]
+                    practice_resources["discussions"].append({
+                        "id": str(discussion['id']),
+                        "title": discussion['title'],
+                        "course_name": course_name,
+                        "course_id": str(course_id),
+                        "message": discussion.get('message', ''),
+                        "html_url": discussion.get('html_url', ''),
+                        "relevance_score": score
+                    })
                 
                 # Search files
-                files = await get_all_paginated_data(
-                    f"/courses/{course_id}/files",
-                    cache_ttl=1800
-                )
-                
-                for file in files:
-                    if not file.get('display_name'):
-                        continue
-                    
-                    filename_lower = file['display_name'].lower()
-                    
-                    if topic_lower in filename_lower:
-                        practice_resources["files"].append({
-                            "id": str(file['id']),
-                            "name": file['display_name'],
-                            "course_name": course_name,
-                            "course_id": str(course_id),
-                            "url": file.get('url', ''),
-                            "size": file.get('size', 0),
-                            "content_type": file.get('content-type', ''),
-                            "relevance_score": fuzz.partial_ratio(topic_lower, filename_lower) / 100.0
-                        })
+                files = [f for f in files if f.get('display_name')]
+                for i, score in _rank_matches(topic_lower, [f['display_name'] for f in files]):
+                    file = files[i]
+                    practice_resources["files"].append({
+                        "id": str(file['id']),
+                        "name": file['display_name'],
+                        "course_name": course_name,
+                        "course_id": str(course_id),
+                        "url": file.get('url', ''),
+                        "size": file.get('size', 0),
+                        "content_type": file.get('content-type', ''),
+                        "relevance_score": score
+                    })
                         
             except Exception as e:
-                print(f"Error searching course {course_id}: {e}")
+                log.warning("Error searching course %s: %s", course_id, e)
                 continue
         
         # Sort by relevance score
@@ -734,127 +932,22 @@ async def get_current_grades(include_what_if: bool = False) -> Dict[str, Any]:
     start_time = time.time()
     
     try:
-        # Get user's enrollments with grades
-        enrollments = await get_all_paginated_data("/users/self/enrollments", {
-            "type": "StudentEnrollment",
-            "include[]": ["current_grading_period_scores", "grades"]
-        }, cache_ttl=900)  # Cache for 15 minutes
-        
-        # Get courses
-        courses = await get_all_paginated_data("/courses", {
-            "enrollment_state": "active"
-        }, cache_ttl=1800)
-        
-        course_grades = []
-        total_points_earned = 0
-        total_points_possible = 0
+        totals = GradeTotals()
         
-        for enrollment in enrollments:
-            course_id = enrollment.get('course_id')
-            if not course_id:
-                continue
-            
-            # Find course info
-            course_info = None
-            for course in courses:
-                if course['id'] == course_id:
-                    course_info = course
-                    break
-            
-            if not course_info:
-                continue
-            
-            # Get grade information
-            current_grade = enrollment.get('grades', {})
-            current_score = current_grade.get('current_score')
-            final_score = current_grade.get('final_score')
-            
-            # Calculate letter grade
-            letter_grade = "N/A"
-            if current_score is not None:
-                if current_score >= 97:
-                    letter_grade = "A+"
-                elif current_score >= 93:
-                    letter_grade = "A"
-                elif current_score >= 90:
-                    letter_grade = "A-"
-                elif current_score >= 87:
-                    letter_grade = "B+"
-                elif current_score >= 83:
-                    letter_grade = "B"
-                elif current_score >= 80:
-                    letter_grade = "B-"
-                elif current_score >= 77:
-                    letter_grade = "C+"
-                elif current_score >= 73:
-                    letter_grade = "C"
-                elif current_score >= 70:
-                    letter_grade = "C-"
-                elif current_score >= 67:
-                    letter_grade = "D+"
-                elif current_score >= 63:
-                    letter_grade = "D"
-                elif current_score >= 60:
-                    letter_grade = "D-"
-                else:
-                    letter_grade = "F"
-            
-            course_grade_info = {
-                "course_id": str(course_id),
-                "course_name": course_info['name'],
-                "current_score": current_score,
-                "final_score": final_score,
-                "letter_grade": letter_grade,
-                "points_earned": current_grade.get('current_points', 0),
-                "points_possible": current_grade.get('possible_points', 0),
-                "grade_trend": "stable"  # Could be enhanced with historical data
-            }
-            
-            course_grades.append(course_grade_info)
-            
-            if current_grade.get('current_points'):
-                total_points_earned += current_grade['current_points']
-            if current_grade.get('possible_points'):
-                total_points_possible += current_grade['possible_points']
-        
-        # Calculate overall GPA (simplified)
-        total_gpa = 0
-        courses_with_grades = 0
-        for course in course_grades:
-            if course['current_score'] is not None:
-                # Convert to 4.0 scale (simplified)
-                score = course['current_score']
-                if score >= 97:
-                    gpa_points = 4.0
-                elif score >= 93:
-                    gpa_points = 4.0
-                elif score >= 90:
-                    gpa_points = 3.7
-                elif score >= 87:
-                    gpa_points = 3.3
-                elif score >= 83:
-                    gpa_points = 3.0
-                elif score >= 80:
-                    gpa_points = 2.7
-                elif score >= 77:
-                    gpa_points = 2.3
-                elif score >= 73:
-                    gpa_points = 2.0
-                elif score >= 70:
-                    gpa_points = 1.7
-                elif score >= 67:
-                    gpa_points = 1.3
-                elif score >= 63:
-                    gpa_points = 1.0
-                elif score >= 60:
-                    gpa_points = 0.7
-                else:
-                    gpa_points = 0.0
-                
-                total_gpa += gpa_points
-                courses_with_grades += 1
+        # Active enrollments with grades and the embedded course, cached for 15 minutes;
+        # each page is aggregated while the next ones are still downloading
+        async for enrollment in iter_paginated_data("/users/self/enrollments", {
+            "type": "StudentEnrollment",
+            "state[]": ["active"],
+            "include[]": ["current_grading_period_scores", "grades", "course"]
+        }, cache_ttl=900):
+            totals.add(enrollment)
         
-        overall_gpa = total_gpa / courses_with_grades if courses_with_grades > 0 else 0
+        course_grades = totals.course_grades
+        courses_with_grades = totals.courses_with_grades
+        total_earned_cents = totals.earned_cents
+        total_possible_cents = totals.possible_cents
+        overall_gpa = totals.total_gpa / courses_with_grades if courses_with_grades > 0 else 0
         
         processing_time = time.time() - start_time
         
@@ -866,13 +959,13 @@ async def get_current_grades(include_what_if: bool = False) -> Dict[str, Any]:
                     "total_courses": len(course_grades),
                     "courses_with_grades": courses_with_grades,
                     "overall_gpa": round(overall_gpa, 2),
-                    "total_points_earned": total_points_earned,
-                    "total_points_possible": total_points_possible,
-                    "overall_percentage": round((total_points_earned / total_points_possible * 100), 2) if total_points_possible > 0 else 0
+                    "total_points_earned": total_earned_cents / 100,
+                    "total_points_possible": total_possible_cents / 100,
+                    "overall_percentage": round((total_earned_cents / total_possible_cents * 100), 2) if total_possible_cents > 0 else 0
                 }
             },
             metadata={
-                "api_calls_made": 2,
+                "api_calls_made": 1,
                 "processing_time": processing_time,
                 "cache_hit": False
             }
@@ -900,23 +993,23 @@ async def calculate_grade_impact(assignment_id: str, course_id: str, hypothetica
     start_time = time.time()
     
     try:
-        # Get assignment details
-        assignment = await make_canvas_request(
-            f"/courses/{course_id}/assignments/{assignment_id}",
-            {
-                "include[]": ["submission"]
-            },
-            cache_ttl=300
-        )
-        
-        # Get current grade
-        enrollment = await make_canvas_request(
-            f"/courses/{course_id}/enrollments",
-            {
-                "type": "StudentEnrollment",
-                "include[]": ["grades"]
-            },
-            cache_ttl=300
+        # Assignment details and current grade are independent, so fetch them together
+        assignment, enrollment = await asyncio.gather(
+            make_canvas_request(
+                f"/courses/{course_id}/assignments/{assignment_id}",
+                {
+                    "include[]": ["submission"]
+                },
+                cache_ttl=300
+            ),
+            make_canvas_request(
+                f"/courses/{course_id}/enrollments",
+                {
+                    "type": "StudentEnrollment",
+                    "include[]": ["grades"]
+                },
+                cache_ttl=300
+            )
         )
         
         if not enrollment:
@@ -931,15 +1024,23 @@ async def calculate_grade_impact(assignment_id: str, course_id: str, hypothetica
         possible_points = current_grade.get('possible_points', 0)
         
         # Assignment details
-        assignment_points = assignment.get('points_possible', 0)
-        submission = assignment.get('submission', {})
-        current_assignment_score = submission.get('score', 0) if submission else 0
+        # Ungraded items report points_possible as null
+        assignment_points = assignment.get('points_possible') or 0
+        submission = assignment.get('submission') or {}
+        current_assignment_score = submission.get('score') or 0
+        is_submitted = bool(submission.get('submitted_at'))
+        
+        # Points kept regardless of this assignment; an already-scored assignment
+        # is already counted in possible_points, an unscored one is added to it
+        had_prior_score = current_assignment_score != 0
+        base_points = current_points - current_assignment_score
+        new_points_possible = possible_points if had_prior_score else possible_points + assignment_points
         
         # Calculate scenarios
         scenarios = {}
         
         # Current grade (if assignment not yet graded)
-        if current_assignment_score == 0 and not submission.get('submitted_at'):
+        if current_assignment_score == 0 and not is_submitted:
             scenarios["current"] = {
                 "description": "Current grade (assignment not submitted)",
                 "score": current_score,
@@ -954,99 +1055,101 @@ async def calculate_grade_impact(assignment_id: str, course_id: str, hypothetica
                 "points_possible": possible_points
             }
         
-        # Perfect score scenario
-        if current_assignment_score == 0:
-            new_points_earned = current_points + assignment_points
-            new_points_possible = possible_points + assignment_points
-        else:
-            new_points_earned = current_points - current_assignment_score + assignment_points
-            new_points_possible = possible_points
+        assignment_info = {
+            "id": assignment_id,
+            "name": assignment['name'],
+            "points_possible": assignment_points,
+            "current_score": current_assignment_score,
+            "submitted": is_submitted
+        }
+        current_grade_info = {
+            "score": current_score,
+            "points_earned": current_points,
+            "points_possible": possible_points
+        }
         
-        new_score = (new_points_earned / new_points_possible * 100) if new_points_possible > 0 else 0
+        # A zero-point or ungraded assignment cannot move the grade, so skip the what-if analysis
+        if assignment_points <= 0:
+            return format_response(
+                success=True,
+                data={
+                    "assignment_info": assignment_info,
+                    "current_grade": current_grade_info,
+                    "scenarios": scenarios,
+                    "minimum_scores_for_letter_grades": {},
+                    "grade_impact_analysis": {
+                        "high_impact": False,
+                        "medium_impact": False,
+                        "low_impact": True,
+                        "assignment_weight": 0,
+                        "note": "Assignment is worth no points and does not affect the grade"
+                    }
+                },
+                metadata={
+                    "api_calls_made": 2,
+                    "processing_time": time.time() - start_time,
+                    "cache_hit": False
+                }
+            )
+        
+        # Points earned under the perfect, zero and (optional) hypothetical scenarios;
+        # they share a denominator, so all scores come from one vector division
+        scenario_points = [base_points + assignment_points, base_points]
+        if hypothetical_score is not None:
+            scenario_points.append(base_points + (hypothetical_score / 100) * assignment_points)
+        if new_points_possible > 0:
+            scenario_scores = (np.array(scenario_points, dtype=float) / new_points_possible * 100).tolist()
+        else:
+            scenario_scores = [0] * len(scenario_points)
         
         scenarios["perfect_score"] = {
             "description": "Grade if scored 100% on this assignment",
-            "score": round(new_score, 2),
-            "points_earned": new_points_earned,
+            "score": round(scenario_scores[0], 2),
+            "points_earned": scenario_points[0],
             "points_possible": new_points_possible,
-            "improvement": round(new_score - current_score, 2)
+            "improvement": round(scenario_scores[0] - current_score, 2)
         }
         
-        # Zero score scenario
-        if current_assignment_score == 0:
-            new_points_earned = current_points
-            new_points_possible = possible_points + assignment_points
-        else:
-            new_points_earned = current_points - current_assignment_score
-            new_points_possible = possible_points
-        
-        new_score = (new_points_earned / new_points_possible * 100) if new_points_possible > 0 else 0
-        
         scenarios["zero_score"] = {
             "description": "Grade if scored 0% on this assignment",
-            "score": round(new_score, 2),
-            "points_earned": new_points_earned,
+            "score": round(scenario_scores[1], 2),
+            "points_earned": scenario_points[1],
             "points_possible": new_points_possible,
-            "impact": round(new_score - current_score, 2)
+            "impact": round(scenario_scores[1] - current_score, 2)
         }
         
-        # Hypothetical score scenario
         if hypothetical_score is not None:
-            hypothetical_points = (hypothetical_score / 100) * assignment_points
-            
-            if current_assignment_score == 0:
-                new_points_earned = current_points + hypothetical_points
-                new_points_possible = possible_points + assignment_points
-            else:
-                new_points_earned = current_points - current_assignment_score + hypothetical_points
-                new_points_possible = possible_points
-            
-            new_score = (new_points_earned / new_points_possible * 100) if new_points_possible > 0 else 0
-            
             scenarios["hypothetical"] = {
                 "description": f"Grade if scored {hypothetical_score}% on this assignment",
-                "score": round(new_score, 2),
-                "points_earned": new_points_earned,
+                "score": round(scenario_scores[2], 2),
+                "points_earned": scenario_points[2],
                 "points_possible": new_points_possible,
-                "improvement": round(new_score - current_score, 2)
+                "improvement": round(scenario_scores[2] - current_score, 2)
             }
         
-        # Calculate minimum scores for letter grades
-        letter_grade_thresholds = {
-            "A": 93, "A-": 90, "B+": 87, "B": 83, "B-": 80,
-            "C+": 77, "C": 73, "C-": 70, "D+": 67, "D": 63, "D-": 60
-        }
+        # Calculate minimum assignment scores needed for every letter grade at once
+        target_points = MIN_SCORE_THRESHOLDS / 100 * new_points_possible
+        min_assignment_scores = target_points - base_points
+        min_assignment_percentages = min_assignment_scores / assignment_points * 100
+        reachable = (min_assignment_percentages >= 0) & (min_assignment_percentages <= 100)
         
-        minimum_scores = {}
-        for grade, threshold in letter_grade_thresholds.items():
-            # Calculate minimum assignment score needed
-            target_points = (threshold / 100) * new_points_possible
-            min_assignment_score = target_points - (current_points - current_assignment_score)
-            min_assignment_percentage = (min_assignment_score / assignment_points * 100) if assignment_points > 0 else 0
-            
-            if 0 <= min_assignment_percentage <= 100:
-                minimum_scores[grade] = {
-                    "minimum_percentage": round(min_assignment_percentage, 1),
-                    "minimum_points": round(min_assignment_score, 1)
-                }
+        minimum_scores = {
+            str(grade): {
+                "minimum_percentage": round(float(percentage), 1),
+                "minimum_points": round(float(points), 1)
+            }
+            for grade, percentage, points in zip(
+                MIN_SCORE_LETTERS[reachable], min_assignment_percentages[reachable], min_assignment_scores[reachable]
+            )
+        }
         
         processing_time = time.time() - start_time
         
         return format_response(
             success=True,
             data={
-                "assignment_info": {
-                    "id": str(assignment_id),
-                    "name": assignment['name'],
-                    "points_possible": assignment_points,
-                    "current_score": current_assignment_score,
-                    "submitted": bool(submission.get('submitted_at'))
-                },
-                "current_grade": {
-                    "score": current_score,
-                    "points_earned": current_points,
-                    "points_possible": possible_points
-                },
+                "assignment_info": assignment_info,
+                "current_grade": current_grade_info,
                 "scenarios": scenarios,
                 "minimum_scores_for_letter_grades": minimum_scores,
                 "grade_impact_analysis": {
@@ -1071,7 +1174,7 @@ async def calculate_grade_impact(assignment_id: str, course_id: str, hypothetica
 
 # Make functions available for import
 __all__ = [
-    'identify_test_by_context', 'gather_study_materials', 'create_study_plan', 'get_practice_resources',
+    'identify_test_by_context', 'identify_test_by_context_stream', 'identify_tests_by_contexts', 'gather_study_materials', 'create_study_plan', 'get_practice_resources',
     'get_current_grades', 'calculate_grade_impact'
 ]
 
@@ -5,12 +5,20 @@ This file provides a unified interface to all Canvas MCP tools.
 """
 
 import asyncio
+import heapq
+import logging
 import os
+import re
 import sys
 import time
+from collections import OrderedDict, defaultdict
+from itertools import chain
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+from rapidfuzz import fuzz, process
+
 # Import all tools from both files
 from canvas_mcp import (
     # Assignment Management Tools
@@ -21,7 +29,7 @@ from canvas_mcp import (
     get_upcoming_events, find_tests_and_exams, get_todays_schedule, get_course_timetable,
     
     # Utility functions
-    make_canvas_request, get_all_paginated_data, format_response,
+    make_canvas_request, get_all_paginated_data, iter_paginated_data, format_response,
     parse_date_string, calculate_days_until_due, is_overdue
 )
 
@@ -33,10 +41,44 @@ from canvas_mcp_additional import (
     get_current_grades, calculate_grade_impact
 )
 
+log = logging.getLogger("canvas_mcp_complete")
+
 # ============================================================================
 # REMAINING TOOLS IMPLEMENTATION
 # ============================================================================
 
+# Shared read-only default for missing nested objects (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# Relevance bonus (out of 100) for titles that start with the query
+PREFIX_BOOST = 15
+
+def _relevance_scores(query_lower: str, titles: List[str]) -> List[float]:
+    """
+    Score titles against the query in one vectorised pass (0.0-1.0).
+    
+    Blends ratio and partial_ratio, so a short query inside a long title doesn't
+    automatically score 100, and boosts titles the query is a prefix of.
+    """
+    if not titles:
+        return []
+    ratio = process.cdist([query_lower], titles, scorer=fuzz.ratio, dtype=np.float64, workers=-1)[0]
+    partial = process.cdist([query_lower], titles, scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1)[0]
+    prefix = np.fromiter((title.startswith(query_lower) for title in titles), dtype=bool, count=len(titles))
+    scores = np.minimum(100.0, 0.5 * ratio + 0.5 * partial + np.where(prefix, PREFIX_BOOST, 0))
+    return (scores / 100.0).tolist()
+
+def _module_info(module: Dict[str, Any]) -> Dict[str, Any]:
+    """Module fields reported by get_course_modules, without its items"""
+    return {
+        "id": module['id'],
+        "name": module['name'],
+        "position": module.get('position', 0),
+        "unlock_at": module.get('unlock_at'),
+        "require_sequential_progress": module.get('require_sequential_progress', False),
+        "publish_final_grade": module.get('publish_final_grade', False)
+    }
+
 async def get_course_modules(course_id: str, include_items: bool = True) -> Dict[str, Any]:
     """
     Get all modules with completion status.
@@ -54,9 +96,7 @@ async def get_course_modules(course_id: str, include_items: bool = True) -> Dict
         # Get modules
         modules = await get_all_paginated_data(
             f"/courses/{course_id}/modules",
-            {
-                "include[]": ["items", "content_details"] if include_items else []
-            },
+            {"include[]": ["items", "content_details"]} if include_items else None,
             cache_ttl=1800
         )
         
@@ -68,42 +108,31 @@ async def get_course_modules(course_id: str, include_items: bool = True) -> Dict
         total_items = 0
         completed_items = 0
         
-        for module in modules:
-            module_info = {
-                "id": str(module['id']),
-                "name": module['name'],
-                "position": module.get('position', 0),
-                "unlock_at": module.get('unlock_at'),
-                "require_sequential_progress": module.get('require_sequential_progress', False),
-                "publish_final_grade": module.get('publish_final_grade', False),
-                "items": []
-            }
-            
-            if include_items:
-                items = module.get('items', [])
-                module_completed_items = 0
+        if include_items:
+            for module in modules:
+                module_info = _module_info(module)
                 
-                for item in items:
-                    item_info = {
-                        "id": str(item['id']),
+                items = module.get('items', [])
+                module_info["items"] = [
+                    {
+                        "id": item['id'],
                         "title": item['title'],
                         "type": item['type'],
                         "position": item.get('position', 0),
                         "url": item.get('url', ''),
                         "html_url": item.get('html_url', ''),
-                        "completion_requirement": item.get('completion_requirement', {}),
-                        "content_details": item.get('content_details', {})
+                        "completion_requirement": item.get('completion_requirement', _EMPTY),
+                        "content_details": item.get('content_details', _EMPTY)
                     }
-                    
-                    # Check completion status
-                    content_details = item.get('content_details', {})
-                    if content_details.get('completion_requirement'):
-                        completion_req = content_details['completion_requirement']
-                        if completion_req.get('completed'):
-                            module_completed_items += 1
-                    
-                    module_info["items"].append(item_info)
-                    total_items += 1
+                    for item in items
+                ]
+                
+                # Check completion status
+                module_completed_items = sum(
+                    1 for item in module_info["items"]
+                    if (item["content_details"].get('completion_requirement') or _EMPTY).get('completed')
+                )
+                total_items += len(items)
                 
                 module_info["completion_status"] = {
                     "total_items": len(items),
@@ -111,15 +140,17 @@ async def get_course_modules(course_id: str, include_items: bool = True) -> Dict
                     "completion_percentage": (module_completed_items / len(items) * 100) if items else 0
                 }
                 completed_items += module_completed_items
-            
-            processed_modules.append(module_info)
+                
+                processed_modules.append(module_info)
+        else:
+            processed_modules = [_module_info(module) for module in modules]
         
         processing_time = time.time() - start_time
         
         return format_response(
             success=True,
             data={
-                "course_id": str(course_id),
+                "course_id": course_id,
                 "course_name": course['name'],
                 "modules": processed_modules,
                 "summary": {
@@ -142,7 +173,134 @@ async def get_course_modules(course_id: str, include_items: bool = True) -> Dict
             error=f"Failed to get course modules: {str(e)}"
         )
 
-async def search_course_content(query: str, course_id: str = None, content_types: List[str] = None) -> Dict[str, Any]:
+# Characters of body text kept on each side of a match in search snippets
+SNIPPET_CONTEXT = 80
+
+# Searchable content types: (result key, course endpoint, index ttl, title field, body field)
+_SEARCH_TYPES = {
+    "assignment": ("assignments", "assignments", 300, "title", "description"),
+    "quiz": ("quizzes", "quizzes", 300, "title", "description"),
+    "discussion": ("discussions", "discussion_topics", 300, "title", "message"),
+    "file": ("files", "files", 1800, "display_name", None),
+    "page": ("pages", "pages", 1800, "title", "body"),
+}
+
+# Fields of each content type kept in the search index (what matching and _format_search_hit read)
+_SEARCH_INDEX_FIELDS = {
+    "assignment": ("id", "title", "description", "due_at", "points_possible", "html_url"),
+    "quiz": ("id", "title", "description", "due_at", "points_possible", "html_url"),
+    "discussion": ("id", "title", "message", "posted_at", "html_url"),
+    "file": ("id", "display_name", "url", "size", "content-type", "created_at"),
+    "page": ("id", "title", "body", "url", "html_url", "updated_at"),
+}
+
+# Per-course search index: (course id, content type) -> (built_at, trimmed items).
+# Later queries against the same course are matched locally until the entry's TTL from
+# _SEARCH_TYPES expires; bounded FIFO so long-running servers don't grow it without limit.
+_search_index: OrderedDict[tuple, tuple] = OrderedDict()
+SEARCH_INDEX_MAX = 256
+
+def _search_index_store(key: tuple, entries: List[Dict[str, Any]]):
+    """Index a course collection, dropping expired entries and the oldest past SEARCH_INDEX_MAX"""
+    now = time.monotonic()
+    expired = [k for k, (built_at, _) in _search_index.items() if now - built_at >= _SEARCH_TYPES[k[1]][2]]
+    for k in expired:
+        del _search_index[k]
+    _search_index.pop(key, None)
+    _search_index[key] = (now, entries)
+    while len(_search_index) > SEARCH_INDEX_MAX:
+        _search_index.popitem(last=False)
+
+def _match_search_item(item: Dict[str, Any], query_pattern: re.Pattern, title_field: str, body_field: Optional[str]) -> Optional[tuple]:
+    """
+    Return (item, lowercased title, snippet) if the item's title or body contains the query.
+    
+    The snippet is the body text around the match, or empty when only the title matched.
+    """
+    title = item.get(title_field)
+    if not title:
+        return None  # Skip items without titles
+    
+    # Case-insensitive search on the original text, so large HTML bodies are never lowercased
+    if query_pattern.search(title):
+        return item, title.lower(), ''
+    if body_field:
+        body = item.get(body_field) or ''
+        match = query_pattern.search(body)
+        if match:
+            return item, title.lower(), body[max(0, match.start() - SNIPPET_CONTEXT):match.end() + SNIPPET_CONTEXT]
+    return None
+
+async def _search_source(course_id: Any, content_type: str, query_pattern: re.Pattern) -> List[tuple]:
+    """
+    Match one course collection against the query, returning (item, lowercased title, snippet) tuples.
+    
+    Served from the search index while it is fresh; otherwise items are streamed from
+    Canvas, matched as their pages arrive, and the index entry is rebuilt on the way.
+    """
+    _, endpoint, ttl, title_field, body_field = _SEARCH_TYPES[content_type]
+    key = (str(course_id), content_type)
+    
+    cached = _search_index.get(key)
+    if cached:
+        if time.monotonic() - cached[0] < ttl:
+            return [hit for item in cached[1] if (hit := _match_search_item(item, query_pattern, title_field, body_field))]
+        del _search_index[key]
+    
+    fields = _SEARCH_INDEX_FIELDS[content_type]
+    entries = []
+    matched = []
+    async for item in iter_paginated_data(f"/courses/{course_id}/{endpoint}"):
+        entry = {field: item[field] for field in fields if field in item}
+        entries.append(entry)
+        hit = _match_search_item(entry, query_pattern, title_field, body_field)
+        if hit:
+            matched.append(hit)
+    
+    _search_index_store(key, entries)
+    return matched
+
+def _format_search_hit(content_type: str, item: Dict[str, Any], course_name: str, course_id: Any, snippet: str, relevance_score: float) -> Dict[str, Any]:
+    """Build the search result entry for one matched item (a body snippet, not the full body)"""
+    get = item.get
+    item_id = item['id']
+    
+    if content_type == "file":
+        return {
+            "id": item_id,
+            "name": item['display_name'],
+            "course_name": course_name,
+            "course_id": course_id,
+            "url": get('url', ''),
+            "size": get('size', 0),
+            "content_type": get('content-type', ''),
+            "created_at": get('created_at'),
+            "relevance_score": relevance_score
+        }
+    
+    hit = {
+        "id": item_id,
+        "title": item['title'],
+        "course_name": course_name,
+        "course_id": course_id,
+        "snippet": snippet,
+        "has_body": bool(get(_SEARCH_TYPES[content_type][4]))
+    }
+    if content_type == "discussion":
+        hit["posted_at"] = get('posted_at')
+        hit["html_url"] = get('html_url', '')
+    elif content_type == "page":
+        hit["url"] = get('url', '')
+        hit["html_url"] = get('html_url', '')
+        hit["updated_at"] = get('updated_at')
+    else:
+        hit["due_at"] = get('due_at')
+        hit["points_possible"] = get('points_possible', 0)
+        hit["html_url"] = get('html_url', '')
+    hit["relevance_score"] = relevance_score
+    return hit
+
+async def search_course_content(query: str, course_id: str = None, content_types: List[str] = None, top_k: int = 50) -> Dict[str, Any]:
     """
     Search across all course content.
     
@@ -150,6 +308,7 @@ async def search_course_content(query: str, course_id: str = None, content_types
         query: Search query
         course_id: Specific course ID (if None, searches all courses)
         content_types: Filter by content types ['assignment', 'quiz', 'discussion', 'file', 'page']
+        top_k: Number of best matches across all content types to return in 'top' (default: 50)
     
     Returns:
         Dictionary containing ranked search results
@@ -176,168 +335,64 @@ async def search_course_content(query: str, course_id: str = None, content_types
         }
         
         query_lower = query.lower()
+        query_pattern = re.compile(re.escape(query), re.IGNORECASE)
+        
+        # Requested content types, resolved once in _SEARCH_TYPES order
+        wanted = frozenset(content_types or _SEARCH_TYPES)
+        search_types = [content_type for content_type in _SEARCH_TYPES if content_type in wanted]
         
+        # One fetch per (course, content type), all issued concurrently; the shared
+        # client's semaphore and rate limiter keep the fan-out within Canvas limits
+        searches = []
         for course in courses:
             current_course_id = course['id']
-            course_name = course['name']
             
             # If course_id is provided, only search that specific course
-            if course_id and str(course_id) != str(current_course_id):
+            if course_id and course_id != current_course_id:
                 continue
             
             # If course_id is a course name pattern (e.g., "CS 3511"), filter by course name
             if course_id and not course_id.isdigit():
-                if course_id.lower() not in course_name.lower():
+                if course_id.lower() not in course['name'].lower():
                     continue
             
-            try:
-                # Search assignments
-                if not content_types or 'assignment' in content_types:
-                    assignments = await get_all_paginated_data(
-                        f"/courses/{current_course_id}/assignments",
-                        cache_ttl=300
-                    )
-                    
-                    for assignment in assignments:
-                        if not assignment.get('title'):
-                            continue  # Skip assignments without titles
-                        title_lower = assignment['title'].lower()
-                        description_lower = assignment.get('description', '').lower()
-                        
-                        if query_lower in title_lower or query_lower in description_lower:
-                            relevance_score = fuzz.partial_ratio(query_lower, title_lower) / 100.0
-                            
-                            search_results["assignments"].append({
-                                "id": str(assignment['id']),
-                                "title": assignment['title'],
-                                "course_name": course_name,
-                                "course_id": str(current_course_id),
-                                "description": assignment.get('description', ''),
-                                "due_at": assignment.get('due_at'),
-                                "points_possible": assignment.get('points_possible', 0),
-                                "html_url": assignment.get('html_url', ''),
-                                "relevance_score": relevance_score
-                            })
-                
-                # Search quizzes
-                if not content_types or 'quiz' in content_types:
-                    quizzes = await get_all_paginated_data(
-                        f"/courses/{current_course_id}/quizzes",
-                        cache_ttl=300
-                    )
-                    
-                    for quiz in quizzes:
-                        if not quiz.get('title'):
-                            continue  # Skip quizzes without titles
-                        title_lower = quiz['title'].lower()
-                        description_lower = quiz.get('description', '').lower()
-                        
-                        if query_lower in title_lower or query_lower in description_lower:
-                            relevance_score = fuzz.partial_ratio(query_lower, title_lower) / 100.0
-                            
-                            search_results["quizzes"].append({
-                                "id": str(quiz['id']),
-                                "title": quiz['title'],
-                                "course_name": course_name,
-                                "course_id": str(current_course_id),
-                                "description": quiz.get('description', ''),
-                                "due_at": quiz.get('due_at'),
-                                "points_possible": quiz.get('points_possible', 0),
-                                "html_url": quiz.get('html_url', ''),
-                                "relevance_score": relevance_score
-                            })
-                
-                # Search discussions
-                if not content_types or 'discussion' in content_types:
-                    discussions = await get_all_paginated_data(
-                        f"/courses/{current_course_id}/discussion_topics",
-                        cache_ttl=300
-                    )
-                    
-                    for discussion in discussions:
-                        if not discussion.get('title'):
-                            continue  # Skip discussions without titles
-                        title_lower = discussion['title'].lower()
-                        message_lower = discussion.get('message', '').lower()
-                        
-                        if query_lower in title_lower or query_lower in message_lower:
-                            relevance_score = fuzz.partial_ratio(query_lower, title_lower) / 100.0
-                            
-                            search_results["discussions"].append({
-                                "id": str(discussion['id']),
-                                "title": discussion['title'],
-                                "course_name": course_name,
-                                "course_id": str(current_course_id),
-                                "message": discussion.get('message', ''),
-                                "posted_at": discussion.get('posted_at'),
-                                "html_url": discussion.get('html_url', ''),
-                                "relevance_score": relevance_score
-                            })
-                
-                # Search files
-                if not content_types or 'file' in content_types:
-                    files = await get_all_paginated_data(
-                        f"/courses/{current_course_id}/files",
-                        cache_ttl=1800
-                    )
-                    
-                    for file in files:
-                        if not file.get('display_name'):
-                            continue
-                        
-                        filename_lower = file['display_name'].lower()
-                        
-                        if query_lower in filename_lower:
-                            relevance_score = fuzz.partial_ratio(query_lower, filename_lower) / 100.0
-                            
-                            search_results["files"].append({
-                                "id": str(file['id']),
-                                "name": file['display_name'],
-                                "course_name": course_name,
-                                "course_id": str(current_course_id),
-                                "url": file.get('url', ''),
-                                "size": file.get('size', 0),
-                                "content_type": file.get('content-type', ''),
-                                "created_at": file.get('created_at'),
-                                "relevance_score": relevance_score
-                            })
-                
-                # Search pages
-                if not content_types or 'page' in content_types:
-                    pages = await get_all_paginated_data(
-                        f"/courses/{current_course_id}/pages",
-                        cache_ttl=1800
-                    )
-                    
-                    for page in pages:
-                        if not page.get('title'):
-                            continue  # Skip pages without titles
-                        title_lower = page['title'].lower()
-                        body_lower = page.get('body', '').lower()
-                        
-                        if query_lower in title_lower or query_lower in body_lower:
-                            relevance_score = fuzz.partial_ratio(query_lower, title_lower) / 100.0
-                            
-                            search_results["pages"].append({
-                                "id": str(page['id']),
-                                "title": page['title'],
-                                "course_name": course_name,
-                                "course_id": str(current_course_id),
-                                "body": page.get('body', ''),
-                                "url": page.get('url', ''),
-                                "html_url": page.get('html_url', ''),
-                                "updated_at": page.get('updated_at'),
-                                "relevance_score": relevance_score
-                            })
-                        
-            except Exception as e:
-                print(f"Error searching course {current_course_id}: {e}")
+            searches.extend((course, content_type) for content_type in search_types)
+        
+        # Each source is matched from the search index, or item by item as its pages stream in
+        results = await asyncio.gather(*(
+            _search_source(course['id'], content_type, query_pattern)
+            for course, content_type in searches
+        ), return_exceptions=True)
+        
+        found = []
+        for (course, content_type), matched in zip(searches, results):
+            if isinstance(matched, Exception):
+                log.warning("Error searching %s in course %s: %s", _SEARCH_TYPES[content_type][0], course['id'], matched)
                 continue
+            found.extend((course, content_type, hit) for hit in matched)
+        
+        # Score every match in one vectorised pass, on a worker thread so the
+        # CPU-bound fuzzy matching doesn't stall other requests on the event loop
+        scores = await asyncio.to_thread(_relevance_scores, query_lower, [title for _, _, (_, title, _) in found])
+        for (course, content_type, (item, _, snippet)), relevance_score in zip(found, scores):
+            search_results[_SEARCH_TYPES[content_type][0]].append(
+                _format_search_hit(content_type, item, course['name'], course['id'], snippet, relevance_score)
+            )
         
         # Sort all results by relevance score
         for content_type in ["assignments", "quizzes", "discussions", "files", "pages"]:
             search_results[content_type].sort(key=lambda x: x['relevance_score'], reverse=True)
         
+        # Best matches across every content type, tagged with the type they came from
+        all_results = chain.from_iterable(
+            ((result_key, hit) for hit in search_results[result_key])
+            for result_key in ["assignments", "quizzes", "discussions", "files", "pages"]
+        )
+        search_results["top"] = [
+            {"result_type": result_key, **hit}
+            for result_key, hit in heapq.nlargest(top_k, all_results, key=lambda pair: pair[1]['relevance_score'])
+        ]
+        
         # Calculate total results
         search_results["total_results"] = (
             len(search_results["assignments"]) +
@@ -353,7 +408,7 @@ async def search_course_content(query: str, course_id: str = None, content_types
             success=True,
             data=search_results,
             metadata={
-                "api_calls_made": len(courses) * 5 + 1,
+                "api_calls_made": len(searches) + (0 if course_id else 1),
                 "processing_time": processing_time,
                 "cache_hit": False
             }
@@ -365,6 +420,78 @@ async def search_course_content(query: str, course_id: str = None, content_types
             error=f"Failed to search course content: {str(e)}"
         )
 
+# Score tiers shared by the strategies: (points, reason), indexed by np.select below
+_POINT_TIERS = [(30, "High point value"), (20, "Medium point value"), (10, "Low point value")]
+_DUE_TIERS = [(25, "Due very soon"), (15, "Due soon"), (10, "Due this week"), (0, None)]
+_RISK_TIERS = [(40, "Low current grade - high risk"), (25, "Below average grade - medium risk"), (10, "Good current grade - low risk")]
+
+def _tier_scores(tiers: List[tuple], index: np.ndarray) -> np.ndarray:
+    """Map an array of tier indices to their scores"""
+    return np.array([score for score, _ in tiers])[index]
+
+def _score_weighted(assignments: List[Dict[str, Any]], course_grades: Dict[Any, float]) -> tuple:
+    """Prioritize by grade impact, boosted for assignments due soon"""
+    points = np.array([a.get("points_possible", 0) for a in assignments])
+    days = np.array([a.get("days_until_due", 0) for a in assignments])
+    point_tier = np.select([points > 50, points > 20], [0, 1], 2)
+    due_tier = np.select([days <= 1, days <= 3, days <= 7], [0, 1, 2], 3)
+    
+    scores = _tier_scores(_POINT_TIERS, point_tier) + _tier_scores(_DUE_TIERS, due_tier)
+    reasoning = [
+        [_POINT_TIERS[p][1], _DUE_TIERS[d][1]] if _DUE_TIERS[d][1] else [_POINT_TIERS[p][1]]
+        for p, d in zip(point_tier.tolist(), due_tier.tolist())
+    ]
+    return scores, reasoning
+
+def _score_urgent(assignments: List[Dict[str, Any]], course_grades: Dict[Any, float]) -> tuple:
+    """Prioritize by due date"""
+    days = [a.get("days_until_due", 0) for a in assignments]
+    scores = np.maximum(0, 100 - np.array(days))
+    return scores, [[f"Due in {d} days"] for d in days]
+
+def _score_effort(assignments: List[Dict[str, Any]], course_grades: Dict[Any, float]) -> tuple:
+    """Prioritize by estimated effort vs impact (points per hour)"""
+    points = [a.get("points_possible", 0) for a in assignments]
+    
+    # Estimate effort in hours based on assignment type
+    submission_types = [a.get("submission_types", []) for a in assignments]
+    effort = np.select(
+        [np.array(["online_upload" in t for t in submission_types], dtype=bool),
+         np.array(["online_text_entry" in t for t in submission_types], dtype=bool)],
+        [4, 2], 1
+    )
+    
+    scores = np.array(points) / effort * 10
+    reasoning = [[f"Estimated {e}h effort for {p} points"] for e, p in zip(effort.tolist(), points)]
+    return scores, reasoning
+
+def _score_risk(assignments: List[Dict[str, Any]], course_grades: Dict[Any, float]) -> tuple:
+    """Prioritize by risk to the current grade in the assignment's course"""
+    grades = np.array([course_grades.get(a.get("course_id"), 0) for a in assignments])
+    points = np.array([a.get("points_possible", 0) for a in assignments])
+    risk_tier = np.select([grades < 70, grades < 80], [0, 1], 2)
+    high_value = points > 50
+    
+    # Higher risk for lower current grades, boosted for high-value assignments
+    scores = _tier_scores(_RISK_TIERS, risk_tier) + np.where(high_value, 20, 0)
+    reasoning = [
+        [_RISK_TIERS[r][1], "High point value"] if high else [_RISK_TIERS[r][1]]
+        for r, high in zip(risk_tier.tolist(), high_value.tolist())
+    ]
+    return scores, reasoning
+
+def _score_unknown(assignments: List[Dict[str, Any]], course_grades: Dict[Any, float]) -> tuple:
+    """Unrecognized strategy: leave every assignment unscored"""
+    return np.zeros(len(assignments), dtype=int), [[] for _ in assignments]
+
+# Vectorised scoring for each prioritize_assignments strategy, returning (priority_scores, reasoning lists)
+_STRATEGIES = {
+    "weighted": _score_weighted,
+    "urgent": _score_urgent,
+    "effort": _score_effort,
+    "risk": _score_risk,
+}
+
 async def prioritize_assignments(strategy: str = "weighted") -> Dict[str, Any]:
     """
     Prioritize assignments by various strategies.
@@ -395,94 +522,16 @@ async def prioritize_assignments(strategy: str = "weighted") -> Dict[str, Any]:
             for grade in grades_result["data"]["course_grades"]:
                 course_grades[grade["course_id"]] = grade["current_score"] or 0
         
-        # Apply prioritization strategy
-        prioritized_assignments = []
+        # Score every assignment at once with the strategy's vectorised scorer
+        scores, reasoning = _STRATEGIES.get(strategy, _score_unknown)(assignments, course_grades)
         
-        for assignment in assignments:
-            priority_score = 0
-            reasoning = []
-            
-            if strategy == "weighted":
-                # Prioritize by grade impact
-                points = assignment.get("points_possible", 0)
-                if points > 50:
-                    priority_score += 30
-                    reasoning.append("High point value")
-                elif points > 20:
-                    priority_score += 20
-                    reasoning.append("Medium point value")
-                else:
-                    priority_score += 10
-                    reasoning.append("Low point value")
-                
-                # Boost for due soon
-                days_until_due = assignment.get("days_until_due", 0)
-                if days_until_due <= 1:
-                    priority_score += 25
-                    reasoning.append("Due very soon")
-                elif days_until_due <= 3:
-                    priority_score += 15
-                    reasoning.append("Due soon")
-                elif days_until_due <= 7:
-                    priority_score += 10
-                    reasoning.append("Due this week")
-            
-            elif strategy == "urgent":
-                # Prioritize by due date
-                days_until_due = assignment.get("days_until_due", 0)
-                priority_score = max(0, 100 - days_until_due)
-                reasoning.append(f"Due in {days_until_due} days")
-            
-            elif strategy == "effort":
-                # Prioritize by estimated effort vs impact
-                points = assignment.get("points_possible", 0)
-                days_until_due = assignment.get("days_until_due", 0)
-                
-                # Estimate effort based on assignment type
-                submission_types = assignment.get("submission_types", [])
-                if "online_upload" in submission_types:
-                    estimated_effort = 4  # Hours
-                elif "online_text_entry" in submission_types:
-                    estimated_effort = 2
-                else:
-                    estimated_effort = 1
-                
-                # Calculate efficiency score (points per hour)
-                efficiency = points / estimated_effort if estimated_effort > 0 else 0
-                priority_score = efficiency * 10
-                reasoning.append(f"Estimated {estimated_effort}h effort for {points} points")
-            
-            elif strategy == "risk":
-                # Prioritize by risk to current grade
-                course_id = assignment.get("course_id")
-                current_grade = course_grades.get(course_id, 0)
-                points = assignment.get("points_possible", 0)
-                days_until_due = assignment.get("days_until_due", 0)
-                
-                # Higher risk for lower current grades
-                if current_grade < 70:
-                    priority_score += 40
-                    reasoning.append("Low current grade - high risk")
-                elif current_grade < 80:
-                    priority_score += 25
-                    reasoning.append("Below average grade - medium risk")
-                else:
-                    priority_score += 10
-                    reasoning.append("Good current grade - low risk")
-                
-                # Boost for high-value assignments
-                if points > 50:
-                    priority_score += 20
-                    reasoning.append("High point value")
-            
-            # Add assignment with priority score
-            prioritized_assignment = assignment.copy()
-            prioritized_assignment["priority_score"] = priority_score
-            prioritized_assignment["reasoning"] = reasoning
-            prioritized_assignments.append(prioritized_assignment)
-        
-        # Sort by priority score
-        prioritized_assignments.sort(key=lambda x: x["priority_score"], reverse=True)
+        # Highest priority first; the stable sort keeps ties in their original order
+        order = np.argsort(-scores, kind="stable").tolist()
+        priority_scores = scores.tolist()
+        prioritized_assignments = [
+            {**assignments[i], "priority_score": priority_scores[i], "reasoning": reasoning[i]}
+            for i in order
+        ]
         
         processing_time = time.time() - start_time
         
@@ -549,39 +598,47 @@ ALL_TOOLS = {
     "prioritize_assignments": prioritize_assignments,
 }
 
+# Registry groupings above, as category -> tool names
+_TOOL_CATEGORIES = {
+    "Assignment Management": [
+        "get_upcoming_assignments", "get_overdue_assignments", "get_assignment_details",
+        "download_assignment_files", "check_submission_status",
+    ],
+    "Calendar & Scheduling": [
+        "get_upcoming_events", "find_tests_and_exams", "get_todays_schedule", "get_course_timetable",
+    ],
+    "Smart Study Tools": [
+        "identify_test_by_context", "gather_study_materials", "create_study_plan", "get_practice_resources",
+    ],
+    "Grade Analytics": ["get_current_grades", "calculate_grade_impact"],
+    "Course Content Access": ["get_course_modules", "search_course_content"],
+    "Smart Priority Tools": ["prioritize_assignments"],
+}
+_CATEGORY_MAP = {name: category for category, names in _TOOL_CATEGORIES.items() for name in names}
+
 async def list_available_tools() -> Dict[str, Any]:
     """List all available tools with descriptions."""
     return format_response(
         success=True,
         data={
-            "total_tools": len(ALL_TOOLS),
-            "tools": {
-                name: {
-                    "name": name,
-                    "description": func.__doc__.split('\n')[1].strip() if func.__doc__ else "No description available",
-                    "category": _get_tool_category(name)
-                }
-                for name, func in ALL_TOOLS.items()
-            }
+            "total_tools": len(_TOOL_METADATA),
+            "tools": _TOOL_METADATA
         }
     )
 
 def _get_tool_category(tool_name: str) -> str:
     """Get the category for a tool."""
-    if tool_name.startswith("get_") and "assignment" in tool_name:
-        return "Assignment Management"
-    elif tool_name.startswith("get_") and ("event" in tool_name or "schedule" in tool_name or "timetable" in tool_name):
-        return "Calendar & Scheduling"
-    elif tool_name in ["identify_test_by_context", "gather_study_materials", "create_study_plan", "get_practice_resources"]:
-        return "Smart Study Tools"
-    elif tool_name.startswith("get_") and "grade" in tool_name or tool_name.startswith("calculate_grade"):
-        return "Grade Analytics"
-    elif tool_name.startswith("get_") and ("module" in tool_name or "content" in tool_name):
-        return "Course Content Access"
-    elif tool_name.startswith("prioritize") or tool_name.startswith("detect") or tool_name.startswith("estimate"):
-        return "Smart Priority Tools"
-    else:
-        return "Other"
+    return _CATEGORY_MAP.get(tool_name, "Other")
+
+# Tool descriptions and categories are fixed at import time, so build them once
+_TOOL_METADATA = {
+    name: {
+        "name": name,
+        "description": func.__doc__.split('\n')[1].strip() if func.__doc__ else "No description available",
+        "category": _get_tool_category(name)
+    }
+    for name, func in ALL_TOOLS.items()
+}
 
 async def run_tool(tool_name: str, **kwargs) -> Dict[str, Any]:
     """Run a specific tool by name."""
@@ -614,7 +671,7 @@ async def main():
     tools_result = await list_available_tools()
     if tools_result["success"]:
         print(f"Available Tools: {tools_result['data']['total_tools']}")
-        for category, tools in _group_tools_by_category(tools_result["data"]["tools"]).items():
+        for category, tools in _group_tools_by_category().items():
             print(f"\n{category}:")
             for tool in tools:
                 print(f"  • {tool['name']}")
@@ -624,15 +681,21 @@ async def main():
     print("Use run_tool(tool_name, **kwargs) to execute any tool")
     print("All tools include comprehensive error handling and caching")
 
-def _group_tools_by_category(tools: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-    """Group tools by category."""
-    categories = {}
+def _build_category_groups(tools: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group tool metadata by category, keeping registry order."""
+    categories = defaultdict(list)
     for tool in tools.values():
-        category = tool["category"]
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(tool)
-    return categories
+        categories[tool["category"]].append(tool)
+    return dict(categories)
+
+# The registry is fixed at import, so its grouping is built once
+_TOOLS_BY_CATEGORY = _build_category_groups(_TOOL_METADATA)
+
+def _group_tools_by_category(tools: Dict[str, Any] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Group tools by category."""
+    if tools is None or tools is _TOOL_METADATA:
+        return _TOOLS_BY_CATEGORY
+    return _build_category_groups(tools)
 
 if __name__ == "__main__":
     asyncio.run(main())
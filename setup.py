@@ -0,0 +1,20 @@
+"""
+Optional native build of the Python hot paths.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+Compiles the listed modules with mypyc into extension modules next to the
+sources; without this step they are simply imported as regular Python.
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="canvas-mcp-core",
+    ext_modules=mypycify([
+        "study_plan_core.py",
+        "grades_core.py",
+    ]),
+)
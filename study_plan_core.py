@@ -0,0 +1,37 @@
+"""
+Study plan allocation kernel.
+
+Plain typed Python so it can be compiled with mypyc (see setup.py); the
+interpreted module behaves identically when no compiled build is present.
+"""
+
+import math
+
+# Absorbs float noise when a topic ends exactly on a day boundary
+_EPSILON = 1e-9
+
+
+def allocate_segments(hours: list[float], days: int, hours_per_day: float) -> list[list[tuple[int, float, bool]]]:
+    """
+    Lay topics end to end and cut the timeline into days of hours_per_day.
+
+    Args:
+        hours: Estimated hours per topic, in study order
+        days: Number of days in the plan
+        hours_per_day: Study hours available each day
+
+    Returns:
+        One list per day of (topic index, hours that day, whether the topic finishes that day)
+    """
+    schedule: list[list[tuple[int, float, bool]]] = [[] for _ in range(days)]
+    start = 0.0
+    for topic in range(len(hours)):
+        end = start + hours[topic]
+        first = int(math.floor(start / hours_per_day + _EPSILON))
+        last = max(first, int(math.ceil(end / hours_per_day - _EPSILON)) - 1)
+        for day in range(first, min(last, days - 1) + 1):
+            day_end = (day + 1) * hours_per_day
+            segment = min(end, day_end) - max(start, day * hours_per_day)
+            schedule[day].append((topic, segment, end <= day_end + _EPSILON))
+        start = end
+    return schedule